@@ -0,0 +1,74 @@
+import copy
+import queue
+import threading
+
+from search_control import SearchControl
+
+POLL_MS = 30 # Chu kỳ (ms) vòng lặp Tk đọc hàng đợi kết quả và cập nhật thanh tiến trình
+
+
+class AIWorker:
+    # Lớp thực thi AI dùng chung cho các giao diện: AI.eval chạy trong luồng nền trên bản sao bàn cờ,
+    # kết quả được đưa vào hàng đợi và chỉ luồng Tk đọc hàng đợi (Tk không cho gọi từ luồng khác).
+    # Mỗi lượt suy nghĩ có số hiệu riêng; kết quả của lượt đã bị hủy (chơi lại, trở về) bị bỏ qua.
+    def __init__(self, ai):
+        self.ai = ai
+        self.results = queue.Queue()
+        self.thread = None
+        self.control = None
+        self.job = 0 # Số hiệu lượt suy nghĩ hiện tại
+
+    def start(self, board):
+        # Bắt đầu suy nghĩ cho thế cờ hiện tại; trả về số hiệu lượt để truyền cho poll()
+        self.cancel()
+        if self.thread is not None:
+            self.thread.join() # Lượt cũ dừng sau vài chục nút; không để hai lượt dùng chung AI
+        self.job += 1
+        self.control = SearchControl(self.ai.max_time, self.ai.max_nodes)
+        self.thread = threading.Thread(target=self.run, args=(self.job, copy.deepcopy(board), self.control),
+                                       daemon=True)
+        self.thread.start()
+        return self.job
+
+    def run(self, job, board, control):
+        try:
+            move = self.ai.eval(board, control=control)
+        except Exception as error: # Lỗi trong luồng nền được báo về luồng Tk thay vì mất đi
+            print(f"AI gặp lỗi khi tìm nước đi: {error!r}")
+            move = None
+        self.results.put((job, move, control.elapsed()))
+
+    def poll(self, job):
+        # Gọi từ luồng Tk: trả về (đã xong, nước đi, thời gian) của lượt `job`
+        while True:
+            try:
+                done_job, move, elapsed = self.results.get_nowait()
+            except queue.Empty:
+                return False, None, None
+            if done_job == job:
+                self.thread = None
+                return True, move, elapsed
+
+    def is_current(self, job):
+        return job == self.job and self.control is not None and not self.control.is_cancelled()
+
+    def progress(self):
+        # (thời gian đã suy nghĩ, tỉ lệ so với giới hạn thời gian, số nút) cho thanh tiến trình
+        control = self.control
+        if control is None:
+            return 0.0, 0.0, 0
+        elapsed = control.elapsed()
+        fraction = min(1.0, elapsed / self.ai.max_time) if self.ai.max_time else 0.0
+        return elapsed, fraction, control.nodes
+
+    def cancel(self):
+        # Hủy lượt đang chạy mà không chặn giao diện; luồng nền tự kết thúc sau vài mili giây
+        if self.control is not None:
+            self.control.cancel()
+
+    def close(self):
+        # Hủy và chờ luồng nền dừng hẳn: gọi trước AI.close để lượt bị hủy không còn dùng bộ nhớ đệm trên đĩa
+        self.cancel()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
@@ -0,0 +1,198 @@
+import argparse
+import json
+import random
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from caro_engine import AI, new_board
+
+# Phân tích hàng loạt thế cờ ngoài giờ chơi (sinh bài tập, kiểm tra hồi quy): đọc thế cờ từ tệp,
+# chia thành từng phần cho các tiến trình con, mỗi thế cờ được AI phân tích với cùng giới hạn số nút / thời gian,
+# và kết quả (nước đi tốt nhất, điểm, PV, số nút...) được ghi ra ngay khi từng phần xong (JSON mỗi dòng).
+#
+# Định dạng văn bản: mỗi dòng một thế cờ "kích_thước hàng,cột hàng,cột ...", các nước đi xen kẽ bắt đầu từ quân 1,
+# bên đang đi suy ra từ số quân; kích thước 0 là bàn không giới hạn (tọa độ tuyệt đối trên bàn ảo).
+# Dòng trống và phần sau '#' được bỏ qua.
+# Định dạng nhị phân: POSITIONS_MAGIC, rồi mỗi thế cờ là POSITION_HEADER (kích thước, số nước) và
+# số nước x MOVE (hàng, cột). Tệp được nhận dạng qua bốn byte đầu nên có thể dùng lẫn hai định dạng.
+POSITIONS_MAGIC = b"CRPS"
+POSITION_HEADER = struct.Struct("<HH")
+MOVE = struct.Struct("<HH")
+CHUNK = 8 # Số thế cờ mỗi lần gửi cho tiến trình con
+IN_FLIGHT = 4 # Số phần đang chờ mỗi tiến trình: đọc tệp dần, không nạp hết vào bộ nhớ
+
+
+def parse_position(line):
+    # (kích thước, [(hàng, cột), ...]) hoặc None với dòng trống / chú thích
+    line = line.split("#", 1)[0].split()
+    if not line:
+        return None
+    moves = []
+    for token in line[1:]:
+        row, col = token.split(",")
+        moves.append((int(row), int(col)))
+    return int(line[0]), moves
+
+
+def format_position(size, moves):
+    return " ".join([str(size)] + [f"{row},{col}" for row, col in moves])
+
+
+def read_positions(path):
+    # Sinh lần lượt (chỉ số, kích thước, nước đi) mà không đọc cả tệp vào bộ nhớ
+    with open(path, "rb") as f:
+        if f.read(len(POSITIONS_MAGIC)) == POSITIONS_MAGIC:
+            index = 0
+            while True:
+                header = f.read(POSITION_HEADER.size)
+                if len(header) < POSITION_HEADER.size:
+                    return
+                size, count = POSITION_HEADER.unpack(header)
+                data = f.read(count * MOVE.size)
+                yield index, size, [move for move in MOVE.iter_unpack(data)]
+                index += 1
+        f.seek(0)
+        index = 0
+        for line in f:
+            position = parse_position(line.decode("utf-8"))
+            if position is not None:
+                yield index, position[0], position[1]
+                index += 1
+
+
+def write_positions(path, positions):
+    # Ghi các (kích thước, nước đi) ở định dạng nhị phân; trả về số thế cờ
+    count = 0
+    with open(path, "wb") as f:
+        f.write(POSITIONS_MAGIC)
+        for size, moves in positions:
+            f.write(POSITION_HEADER.pack(size, len(moves)))
+            f.write(b"".join(MOVE.pack(row, col) for row, col in moves))
+            count += 1
+    return count
+
+
+class Analyzer:
+    # Một AI dùng lại cho nhiều thế cờ; bảng chuyển vị, thứ tự nước đi và bộ nhớ đệm điểm lá được xóa giữa
+    # các thế cờ để kết quả không phụ thuộc thứ tự hay cách chia việc (cùng giới hạn số nút cho cùng kết quả)
+    def __init__(self, max_nodes=20000, max_time=None, seed=0, **options):
+        self.ai = AI(**options)
+        self.ai.max_nodes = max_nodes
+        self.ai.max_time = max_time
+        self.seed = seed
+
+    def analyse(self, index, size, moves):
+        board = new_board(size)
+        player = 1
+        for row, col in moves:
+            board.mark_sqr(row, col, player)
+            player = 3 - player
+        result = {"index": index, "size": size, "player": player, "moves": len(moves)}
+        for row, col in moves[-1:]:
+            if board.final_state(row, col):
+                result.update(move=None, error="thế cờ đã kết thúc")
+                return result
+        ai = self.ai
+        ai.player, ai.opponent = player, 3 - player
+        ai.transposition_table.clear()
+        ai.move_orderer.clear()
+        if ai.eval_cache is not None:
+            ai.eval_cache.clear() # Điểm lá được lưu theo góc nhìn của ai.player, vừa đổi ở trên
+        random.seed(self.seed + index) # Sách khai cuộc chọn ngẫu nhiên giữa các nước ngang nhau
+        move, stats = ai.eval_with_stats(board)
+        result.update(move=move, score=stats["score"], pv=stats["pv"], depth=stats["depth"],
+                      nodes=stats["nodes"], time=stats["time"], source=stats["source"])
+        return result
+
+    def close(self):
+        self.ai.close()
+
+
+_analyzer = None
+
+
+def init_worker(options):
+    global _analyzer
+    _analyzer = Analyzer(**options)
+
+
+def analyse_chunk(chunk):
+    return [_analyzer.analyse(*position) for position in chunk]
+
+
+def chunks(positions, size):
+    chunk = []
+    for position in positions:
+        chunk.append(position)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def analyse_positions(positions, workers=1, chunk_size=CHUNK, **options):
+    # Sinh kết quả theo thứ tự phân tích xong (mỗi kết quả có "index" của thế cờ).
+    # `options` là tham số của Analyzer (max_nodes, max_time, seed và tham số của AI)
+    if workers <= 1:
+        analyzer = Analyzer(**options)
+        try:
+            for position in positions:
+                yield analyzer.analyse(*position)
+        finally:
+            analyzer.close()
+        return
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(options,)) as pool:
+        pending = set()
+        for chunk in chunks(positions, chunk_size):
+            pending.add(pool.submit(analyse_chunk, chunk))
+            if len(pending) >= workers * IN_FLIGHT:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Phân tích hàng loạt thế cờ (kết quả JSON mỗi dòng)")
+    parser.add_argument("input", help="Tệp thế cờ (văn bản hoặc nhị phân)")
+    parser.add_argument("--output", default="-", help="Tệp kết quả (mặc định: stdout)")
+    parser.add_argument("--nodes", type=int, default=20000, help="Giới hạn số nút mỗi thế cờ")
+    parser.add_argument("--time", type=float, default=None, help="Giới hạn thời gian mỗi thế cờ (giây)")
+    parser.add_argument("--workers", type=int, default=1, help="Số tiến trình phân tích song song")
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="Số thế cờ mỗi lần gửi cho tiến trình con")
+    parser.add_argument("--evaluator", default="pattern", choices=["pattern", "window", "scan"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--convert", metavar="OUTPUT", help="Chỉ chuyển tệp thế cờ sang định dạng nhị phân")
+    args = parser.parse_args()
+
+    if args.convert:
+        count = write_positions(args.convert, ((size, moves) for _, size, moves in read_positions(args.input)))
+        print(f"{count} thế cờ -> {args.convert}", file=sys.stderr)
+        return
+
+    options = {"max_nodes": args.nodes, "max_time": args.time, "seed": args.seed, "evaluator": args.evaluator}
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    count = nodes = 0
+    try:
+        for result in analyse_positions(read_positions(args.input), args.workers, args.chunk, **options):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            count += 1
+            nodes += result.get("nodes", 0)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"{count} thế cờ trong {elapsed:.1f}s: {count / elapsed if elapsed else 0.0:.1f} thế cờ/s, "
+          f"{nodes / elapsed if elapsed else 0.0:.0f} nút/s ({args.workers} tiến trình)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
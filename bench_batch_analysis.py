@@ -0,0 +1,44 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+from batch_analysis import analyse_positions, read_positions, write_positions
+
+# Đo thông lượng phân tích hàng loạt (thế cờ/giây) theo số tiến trình trên cùng một tệp thế cờ ngẫu nhiên
+POSITIONS = 96
+SIZES = (11, 15)
+MAX_NODES = 2000
+
+
+def random_positions(count, seed=0):
+    # Thế cờ 8-14 quân đặt ngẫu nhiên quanh tâm (giữa ván, chưa ai thắng nên AI phải tìm kiếm)
+    rng = random.Random(seed)
+    for _ in range(count):
+        size = rng.choice(SIZES)
+        center = size // 2
+        cells = [(r, c) for r in range(center - 3, center + 4) for c in range(center - 3, center + 4)]
+        yield size, rng.sample(cells, rng.randint(8, 14))
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, max_workers} & set(range(1, max_workers + 1)))
+    print(f"CPU cores: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "positions.bin")
+        write_positions(path, random_positions(POSITIONS))
+        base = None
+        for workers in counts:
+            start = time.perf_counter()
+            results = list(analyse_positions(read_positions(path), workers, max_nodes=MAX_NODES))
+            elapsed = time.perf_counter() - start
+            rate = len(results) / elapsed
+            base = base or rate
+            print(f"workers {workers:>2}: {len(results)} thế cờ trong {elapsed:6.2f}s, "
+                  f"{rate:6.1f} thế cờ/s, tăng tốc {rate / base:4.2f}x")
+
+
+if __name__ == '__main__':
+    main()
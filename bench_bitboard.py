@@ -0,0 +1,93 @@
+import random
+import time
+
+from caro_engine import Board, AI
+from bitboard import BitBoard
+from search_control import SearchControl
+
+# So sánh tốc độ (số thế cờ/giây) giữa Board dùng mảng NumPy và BitBoard
+SIZES = [5, 7, 11]
+POSITIONS = 200 # Số thế cờ ngẫu nhiên cho mỗi kích thước
+
+
+def random_moves(size, rng):
+    # Sinh một chuỗi nước đi ngẫu nhiên chưa kết thúc ván
+    board = Board(size)
+    moves = []
+    player = 1
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+    for row, col in cells[:rng.randint(2, size * size // 2)]:
+        board.mark_sqr(row, col, player)
+        if board.final_state(row, col):
+            break
+        moves.append((row, col, player))
+        player = 3 - player
+    return moves
+
+
+def build(board_cls, size, moves):
+    board = board_cls(size)
+    for row, col, player in moves:
+        board.mark_sqr(row, col, player)
+    return board
+
+
+def probe(board):
+    # Công việc điển hình tại một nút tìm kiếm: liệt kê ô trống, kiểm tra thắng, chuỗi dài nhất
+    board.get_empty_sqrs()
+    board.has_win(1)
+    board.has_win(2)
+    board.longest_sequence(1)
+    board.longest_sequence(2)
+
+
+def check_same(size, moves):
+    # Đảm bảo hai cách biểu diễn cho cùng kết quả
+    a, b = build(Board, size, moves), build(BitBoard, size, moves)
+    assert a.get_empty_sqrs() == b.get_empty_sqrs()
+    for player in (1, 2):
+        assert a.has_win(player) == b.has_win(player)
+        assert a.longest_sequence(player) == b.longest_sequence(player)
+    for row, col, _ in moves:
+        assert a.final_state(row, col) == b.final_state(row, col)
+    ai = AI(evaluator='scan', eval_cache_mb=0)
+    assert ai.evaluate_board(a) == ai.evaluate_board(b)
+
+
+def positions_per_sec(board_cls, size, positions, work):
+    boards = [build(board_cls, size, moves) for moves in positions]
+    start = time.perf_counter()
+    for board in boards:
+        work(board)
+    return len(boards) / (time.perf_counter() - start)
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'size':>5} {'workload':>15} {'Board pos/s':>12} {'BitBoard pos/s':>15} {'speedup':>8}")
+    for size in SIZES:
+        positions = [random_moves(size, rng) for _ in range(POSITIONS)]
+        for moves in positions:
+            check_same(size, moves)
+        ai = AI(evaluator='scan', eval_cache_mb=0) # Đánh giá duyệt toàn bộ bàn cờ để đo tốc độ đọc ô
+        workloads = [("probe", probe), ("check_win", lambda b: ai.check_win(b, 1) or ai.check_win(b, 2)),
+                     ("evaluate_board", ai.evaluate_board)]
+        for name, work in workloads:
+            base = positions_per_sec(Board, size, positions, work)
+            bits = positions_per_sec(BitBoard, size, positions, work)
+            print(f"{size:>5} {name:>15} {base:>12.0f} {bits:>15.0f} {bits / base:>7.1f}x")
+
+    # Thời gian AI.minimax độ sâu cố định trên cùng một thế cờ
+    for size in SIZES:
+        moves = [(size // 2, size // 2, 1), (size // 2, size // 2 + 1, 2), (size // 2 + 1, size // 2, 1)]
+        for board_cls in (Board, BitBoard):
+            ai = AI()
+            board = build(board_cls, size, moves)
+            start = time.perf_counter()
+            score, move = ai.minimax(board, 1, -float('inf'), float('inf'), True, SearchControl())
+            print(f"{size}x{size} minimax depth 1 {board_cls.__name__:>8}: {move} {score} in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
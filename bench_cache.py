@@ -0,0 +1,83 @@
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from caro_engine import Board, AI
+
+# Đo tác dụng của bộ nhớ đệm trên đĩa (search_cache): phân tích cùng các thế cờ trong hai "phiên" liên tiếp
+# (hai AI mới, cùng một tệp) và so sánh thời gian / tỉ lệ trúng; sau đó cho nhiều tiến trình cùng ghi
+# vào một tệp có giới hạn số mục nhỏ để kiểm tra ghi đồng thời và việc xóa mục cũ.
+SIZES = [7, 11]
+POSITIONS = 6 # Số thế cờ ngẫu nhiên mỗi kích thước
+MAX_TIME = 1.0
+
+
+def random_positions(size, rng):
+    center = size // 2
+    near = [(r, c) for r in range(center - 2, center + 3) for c in range(center - 2, center + 3)]
+    positions = []
+    for _ in range(POSITIONS):
+        cells = rng.sample(near, rng.choice((4, 6)))
+        positions.append([(r, c, 1 + i % 2) for i, (r, c) in enumerate(cells)])
+    return positions
+
+
+def session(path, positions):
+    ai = AI(cache_path=path)
+    ai.max_time = MAX_TIME
+    ai.cache_depth = 1 # Phiên sau dùng ngay mọi kết quả đã lưu
+    start = time.perf_counter()
+    moves = []
+    for size, stones in positions:
+        board = Board(size)
+        for row, col, player in stones:
+            board.mark_sqr(row, col, player)
+        moves.append(ai.eval(board))
+    elapsed = time.perf_counter() - start
+    stats = ai.cache.stats()
+    ai.close()
+    return moves, elapsed, stats
+
+
+def writer(task):
+    path, seed = task
+    from search_cache import SearchCache
+    cache = SearchCache(path, max_entries=500)
+    rng = random.Random(seed)
+    for _ in range(2000):
+        board = Board(7)
+        for _ in range(rng.randint(1, 6)):
+            row, col = rng.randrange(7), rng.randrange(7)
+            if board.empty_sqr(row, col):
+                board.mark_sqr(row, col, rng.choice((1, 2)))
+        move = next(move for move in [(r, c) for r in range(7) for c in range(7)] if board.empty_sqr(*move))
+        cache.store(board, 2, move, rng.random(), rng.randint(2, 8))
+        cache.lookup(board, 2)
+    stats = cache.stats()
+    cache.close()
+    return stats
+
+
+def main():
+    rng = random.Random(11)
+    positions = [(size, stones) for size in SIZES for stones in random_positions(size, rng)]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "cache.sqlite")
+        for name in ("phiên 1", "phiên 2"):
+            moves, elapsed, stats = session(path, positions)
+            print(f"{name}: {elapsed:.2f}s, nạp {stats['loaded_entries']} mục trong {stats['load_time'] * 1000:.1f}ms, "
+                  f"trúng {stats['hits']}/{stats['probes']}, ghi {stats['stores']}")
+        path = os.path.join(folder, "shared.sqlite")
+        start = time.perf_counter()
+        with ProcessPoolExecutor(4) as pool:
+            results = list(pool.map(writer, [(path, seed) for seed in range(4)]))
+        elapsed = time.perf_counter() - start
+        print(f"4 tiến trình x 2000 lần ghi + tra: {elapsed:.2f}s, số mục cuối {results[-1]['entries']} "
+              f"(giới hạn 500), đã xóa {sum(stats['evictions'] for stats in results)}, "
+              f"trúng {sum(stats['hits'] for stats in results)}/{sum(stats['probes'] for stats in results)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import random
+import time
+import tracemalloc
+
+from caro_engine import Board, AI
+
+# So sánh các cách thay thế của bộ nhớ đệm điểm lá (eval_cache) trong các lượt tìm kiếm dài trên bàn 11x11:
+# tỉ lệ trúng, số mục bị thay, thời gian, và bộ nhớ đang dùng sau mỗi nước đi (gồm cả bảng chuyển vị 16MB
+# đang được lấp dần); số mục trong bộ nhớ đệm không vượt quá sức chứa tính từ giới hạn bộ nhớ.
+SIZE = 11
+MOVES = 8 # Số nước đi AI tìm liên tiếp trong một ván
+MAX_TIME = 1.5
+CACHE_MB = 0.5
+
+
+def play(evaluator, cache_mb, policy, rng):
+    ai = AI(evaluator=evaluator, eval_cache_mb=cache_mb, eval_cache_policy=policy)
+    ai.max_time = MAX_TIME
+    board = Board(SIZE)
+    center = SIZE // 2
+    memory = []
+    start = time.perf_counter()
+    nodes = 0
+    for ply in range(MOVES):
+        ai.player, ai.opponent = 1 + ply % 2, 2 - ply % 2
+        ai.transposition_table.new_search()
+        ai.prepare_board(board)
+        if board.marked_sqrs == 0:
+            move = (center, center)
+        else:
+            move = ai.search(board, 10, MAX_TIME)["best_move"]
+        board.mark_sqr(*move, ai.player)
+        memory.append((tracemalloc.get_traced_memory()[0] / 1024 / 1024, len(ai.eval_cache) if ai.eval_cache else 0))
+        nodes = ai.nodes
+    return ai, time.perf_counter() - start, nodes, memory
+
+
+def main():
+    tracemalloc.start()
+    for evaluator in ("scan", "pattern"): # 'pattern' mặc định không dùng bộ nhớ đệm; đo để so sánh
+        for cache_mb, policy in ((0, "2way"), (CACHE_MB, "lru"), (CACHE_MB, "clock"), (CACHE_MB, "2way")):
+            ai, elapsed, nodes, memory = play(evaluator, cache_mb, policy, random.Random(1))
+            stats = ai.eval_cache.stats() if ai.eval_cache else None
+            name = f"{policy} {cache_mb}MB" if cache_mb else "không đệm"
+            line = f"{evaluator:>7} {name:>12}: {nodes / elapsed:>7.0f} nút/s"
+            if stats:
+                line += (f", trúng {stats['hit_rate']:.3f}, thay {stats['evictions']:>6}, "
+                         f"sức chứa {stats['capacity']}")
+            print(line)
+            print("        bộ nhớ MB / số mục đệm sau mỗi nước: " + " ".join(f"{m:.1f}/{n}" for m, n in memory))
+            ai.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from caro_engine import new_board
+from game_record import GameWriter, GameReader, Replayer, new_game, add_move
+
+# Đo tệp lưu trữ ván cờ: kích thước văn bản / nhị phân, tốc độ ghi, lập chỉ mục, đọc và dựng lại thế cờ
+# (đánh dần từng nước so với dựng lại bàn cờ từ đầu mỗi nước), cùng bộ nhớ tối đa khi đọc lần lượt
+GAMES = 20000
+SIZES = (7, 11, 15)
+REBUILD_GAMES = 200 # Dựng lại từ đầu mỗi nước chậm nên chỉ đo trên vài ván
+
+
+def random_games(count, seed=0):
+    # Ván ngẫu nhiên: mỗi nước đánh cạnh một quân đã có, dừng khi có người thắng, đủ 60 nước hoặc hết ô.
+    # Khoảng một nửa số nước có thống kê như nước đi của AI
+    rng = random.Random(seed)
+    boards = {}
+    for _ in range(count):
+        size = rng.choice(SIZES)
+        board = boards.get(size) or boards.setdefault(size, new_board(size))
+        game = new_game(size, 1700000000 + rng.randrange(10 ** 7))
+        player = 1
+        while len(game["moves"]) < min(60, size * size):
+            moves = board.candidates.sorted() if board.marked_sqrs else [(size // 2, size // 2)]
+            row, col = rng.choice(moves)
+            board.mark_sqr(row, col, player)
+            stats = None
+            if player == 2:
+                stats = {"nodes": rng.randrange(50000), "depth": rng.randint(1, 10), "score": rng.randint(-2000, 2000)}
+            add_move(game, row, col, rng.randrange(3000), stats)
+            if board.final_state(row, col):
+                game["result"] = player
+                break
+            player = 3 - player
+        else:
+            game["result"] = 0
+        for row, col, *_ in reversed(game["moves"]):
+            board.unmake_sqr(row, col)
+        board.winning_line = None
+        yield game
+
+
+def rebuild_replay(game):
+    # Cách làm chậm: dựng bàn cờ mới cho từng thế cờ
+    player_of = [1 + ply % 2 for ply in range(len(game["moves"]))]
+    for ply in range(len(game["moves"])):
+        board = new_board(game["size"])
+        for (row, col, *_), player in zip(game["moves"][:ply + 1], player_of):
+            board.mark_sqr(row, col, player)
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else GAMES
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        sample = list(random_games(games))
+        print(f"Sinh {games} ván: {time.perf_counter() - start:.1f}s, {sum(len(g['moves']) for g in sample)} nước")
+        for name in ("games.txt", "games.bin"):
+            path = os.path.join(tmp, name)
+            start = time.perf_counter()
+            writer = GameWriter(path)
+            for game in sample:
+                writer.write(game)
+            writer.close()
+            write_time = time.perf_counter() - start
+            reader = GameReader(path)
+            start = time.perf_counter()
+            offsets = reader.offsets()
+            index_time = time.perf_counter() - start
+            start = time.perf_counter()
+            same = all(game == original for game, original in zip(reader, sample))
+            read_time = time.perf_counter() - start
+            tracemalloc.start() # Đo bộ nhớ ở lần đọc riêng: tracemalloc làm chậm việc đọc
+            for _ in reader:
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{name}: {os.path.getsize(path) / len(sample):6.1f} byte/ván, ghi {write_time:5.2f}s, "
+                  f"chỉ mục {index_time:5.2f}s ({len(offsets)} ván), đọc {read_time:5.2f}s "
+                  f"(bộ nhớ tối đa {peak / 1024:.0f} KB), khớp: {same}")
+        replayer = Replayer()
+        start = time.perf_counter()
+        for game in GameReader(path):
+            for _ in replayer.replay(game):
+                pass
+        elapsed = time.perf_counter() - start
+        print(f"Dựng lại dần từng nước: {replayer.positions} thế cờ trong {elapsed:.2f}s "
+              f"({replayer.positions / elapsed:.0f} thế cờ/s)")
+        start = time.perf_counter()
+        positions = 0
+        for game in sample[:REBUILD_GAMES]:
+            rebuild_replay(game)
+            positions += len(game["moves"])
+        elapsed = time.perf_counter() - start
+        print(f"Dựng lại từ đầu mỗi nước: {positions} thế cờ trong {elapsed:.2f}s ({positions / elapsed:.0f} thế cờ/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+from caro_engine import Board, AI
+
+# Đo tốc độ tìm kiếm song song (chia nước đi gốc) theo số tiến trình: thời gian để đạt cùng độ sâu
+POSITIONS = [
+    (7, [(3, 3, 1), (3, 4, 2), (4, 4, 1), (2, 2, 2), (4, 3, 1)], 5),
+    (11, [(5, 5, 1), (5, 6, 2), (6, 6, 1), (4, 4, 2), (6, 5, 1)], 4),
+]
+
+
+def time_to_depth(size, moves, depth, workers):
+    board = Board(size)
+    for row, col, player in moves:
+        board.mark_sqr(row, col, player)
+    ai = AI(workers=workers)
+    ai.max_time = 3600
+    ai.prepare_board(board)
+    if workers > 1:
+        ai.iterative_deepening(board, 1, ai.max_time) # Khởi động các tiến trình trước khi đo
+    start = time.perf_counter()
+    move = ai.iterative_deepening(board, depth, ai.max_time)
+    elapsed = time.perf_counter() - start
+    ai.close()
+    return move, elapsed
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, max_workers} & set(range(1, max_workers + 1)))
+    print(f"CPU cores: {os.cpu_count()}")
+    for size, moves, depth in POSITIONS:
+        base = None
+        for workers in counts:
+            move, elapsed = time_to_depth(size, moves, depth, workers)
+            base = base or elapsed
+            print(f"{size}x{size} depth {depth} workers {workers:>2}: {elapsed:6.2f}s speedup {base / elapsed:4.2f}x move {move}")
+
+
+if __name__ == '__main__':
+    main()
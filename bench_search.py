@@ -0,0 +1,41 @@
+import time
+
+from caro_engine import Board, AI
+
+# So sánh minimax cũ và negamax PVS (cùng độ sâu, cùng bộ thế cờ cố định):
+# số nút đã duyệt, thời gian và nước đi tốt nhất
+POSITIONS = [
+    (7, [(3, 3, 1), (3, 4, 2), (4, 4, 1), (2, 2, 2), (4, 3, 1)]),
+    (7, [(3, 3, 1), (2, 3, 2), (3, 2, 1), (3, 4, 2), (4, 2, 1), (2, 2, 2), (5, 2, 1)]),
+    (11, [(5, 5, 1), (5, 6, 2), (6, 6, 1), (4, 4, 2), (6, 5, 1)]),
+    (11, [(5, 5, 1), (4, 5, 2), (5, 4, 1), (5, 6, 2), (6, 4, 1), (4, 4, 2), (4, 6, 1), (3, 7, 2), (7, 3, 1)]),
+]
+DEPTHS = {7: 5, 11: 4}
+
+
+def run(search, size, moves, depth):
+    board = Board(size)
+    for row, col, player in moves:
+        board.mark_sqr(row, col, player)
+    ai = AI(search=search)
+    ai.max_time = 3600 # Không giới hạn thời gian để so sánh ở cùng độ sâu
+    ai.prepare_board(board)
+    start = time.perf_counter()
+    move = ai.iterative_deepening(board, depth, ai.max_time)
+    return move, ai.nodes, time.perf_counter() - start, ai
+
+
+def main():
+    print(f"{'size':>5} {'depth':>5} {'minimax nodes':>14} {'pvs nodes':>10} {'minimax s':>10} {'pvs s':>7}  moves")
+    for size, moves in POSITIONS:
+        depth = DEPTHS[size]
+        mm_move, mm_nodes, mm_time, _ = run('minimax', size, moves, depth)
+        pv_move, pv_nodes, pv_time, ai = run('pvs', size, moves, depth)
+        print(f"{size:>5} {depth:>5} {mm_nodes:>14} {pv_nodes:>10} {mm_time:>10.2f} {pv_time:>7.2f}  {mm_move} {pv_move}")
+        for info in ai.last_search["depths"]:
+            print(f"      depth {info['depth']}: score {info['score']} nodes {info['nodes']} "
+                  f"time {info['time']:.3f}s pv {info['pv']}")
+
+
+if __name__ == '__main__':
+    main()
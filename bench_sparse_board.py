@@ -0,0 +1,57 @@
+import copy
+import random
+import time
+
+from caro_engine import Board, AI
+from sparse_board import SparseBoard
+
+# So sánh Board (mảng dày) với SparseBoard trên các bàn lớn: thời gian một lượt AI với cùng giới hạn số nút
+# (gồm sao chép bàn cờ như AIWorker, dựng bộ đánh giá, tìm chuỗi thắng và tìm kiếm), số nút/giây,
+# và bàn cờ không giới hạn với cùng các thế cờ đặt ở giữa.
+SIZES = [11, 15, 19]
+POSITIONS = 5
+STONES = 16
+MAX_NODES = 1500
+
+
+def random_stones(size, rng):
+    center = size // 2
+    near = [(r, c) for r in range(center - 3, center + 4) for c in range(center - 3, center + 4)]
+    cells = rng.sample(near, STONES)
+    return [(r - center, c - center, 1 + i % 2) for i, (r, c) in enumerate(cells)]
+
+
+def run(make_board, positions):
+    total = nodes = 0
+    for stones in positions:
+        board = make_board()
+        offset = board.size // 2
+        for row, col, player in stones:
+            board.mark_sqr(row + offset, col + offset, player)
+        ai = AI(player=1)
+        ai.max_nodes = MAX_NODES
+        ai.max_time = 3600
+        ai.threat_search.max_nodes = MAX_NODES
+        start = time.perf_counter()
+        ai.eval(copy.deepcopy(board))
+        total += time.perf_counter() - start
+        nodes += ai.nodes + ai.threat_search.total_nodes
+    return total / len(positions), nodes / total
+
+
+def main():
+    rng = random.Random(2)
+    for size in SIZES:
+        positions = [random_stones(size, rng) for _ in range(POSITIONS)]
+        dense_time, dense_nps = run(lambda: Board(size), positions)
+        sparse_time, sparse_nps = run(lambda: SparseBoard(size), positions)
+        line = (f"{size}x{size}: Board {dense_time:.3f}s/lượt ({dense_nps:.0f} nút/s), "
+                f"SparseBoard {sparse_time:.3f}s/lượt ({sparse_nps:.0f} nút/s)")
+        if size == SIZES[-1]:
+            inf_time, inf_nps = run(lambda: SparseBoard(), positions)
+            line += f", không giới hạn {inf_time:.3f}s/lượt ({inf_nps:.0f} nút/s)"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
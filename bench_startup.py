@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+# Đo thời gian khởi động: import lõi AI không giao diện (caro_engine) so với giao diện (caro),
+# và thời gian tới nước đi đầu tiên. Mỗi phép đo chạy trong một tiến trình Python mới.
+RUNS = 5
+
+SNIPPETS = [
+    ("python rỗng", "pass"),
+    ("import caro_engine", "import caro_engine"),
+    ("import caro (tkinter)", "import caro"),
+    ("caro_engine + nước đi đầu tiên",
+     "from caro_engine import Board, AI\n"
+     "b = Board(11)\n"
+     "for r, c, p in [(5, 5, 1), (5, 6, 2), (6, 6, 1)]: b.mark_sqr(r, c, p)\n"
+     "ai = AI(); ai.max_time = 0.2; ai.eval(b)"),
+]
+
+TIMER = (
+    "import time, sys\n"
+    "start = time.perf_counter()\n"
+    "{code}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "heavy = [m for m in ('tkinter', 'numpy', 'concurrent.futures', 'threading') if m in sys.modules]\n"
+    "print(elapsed, ','.join(heavy))\n"
+)
+
+
+def measure(code):
+    times, heavy = [], ""
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, "-c", TIMER.format(code=code)],
+                             capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+        heavy = out[1] if len(out) > 1 else ""
+    return min(times), heavy
+
+
+def main():
+    for name, code in SNIPPETS:
+        try:
+            best, heavy = measure(code)
+        except subprocess.CalledProcessError as error:
+            print(f"{name:>32}: lỗi ({error.stderr.strip().splitlines()[-1]})")
+            continue
+        print(f"{name:>32}: {best * 1000:7.1f} ms  đã nạp: {heavy or '-'}")
+
+
+if __name__ == '__main__':
+    main()
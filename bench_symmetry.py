@@ -0,0 +1,89 @@
+import random
+import time
+
+from caro_engine import Board, AI
+from opening_book import OpeningBook
+from symmetry import transform
+
+# So sánh tỉ lệ trúng của bảng chuyển vị và sách khai cuộc khi dùng khóa chuẩn theo 8 phép đối xứng
+# với khi dùng khóa Zobrist thường, trên các thế cờ đầu và giữa ván 5x5 / 7x7 ở mọi hướng xoay/lật.
+POSITIONS = [
+    (5, [(2, 2, 1), (1, 2, 2)], 4),
+    (5, [(2, 2, 1), (1, 1, 2), (3, 2, 1), (1, 3, 2)], 4),
+    (7, [(3, 3, 1), (3, 4, 2), (4, 4, 1)], 3),
+    (7, [(3, 3, 1), (3, 4, 2), (4, 4, 1), (2, 2, 2), (4, 3, 1), (5, 3, 2)], 3),
+]
+
+
+class RawBook(OpeningBook):
+    # Sách khai cuộc tra theo khóa Zobrist thường (không đổi hướng), để so sánh
+    def add(self, board, moves):
+        self.entries.setdefault(board.hash, []).extend(moves)
+
+    def lookup(self, board):
+        self.probes += 1
+        moves = [move for move in self.entries.get(board.hash, ()) if board.empty_sqr(*move)]
+        if moves:
+            self.hits += 1
+        return moves
+
+
+def oriented(size, stones, sym):
+    board = Board(size)
+    for row, col, player in stones:
+        r, c = transform(row, col, sym, size)
+        board.mark_sqr(r, c, player)
+    return board
+
+
+def tt_hit_rate(symmetry):
+    # Tìm kiếm lần lượt trên 8 hướng của cùng một thế cờ với cùng một AI (bảng chuyển vị giữ lại giữa các lần)
+    results = []
+    for size, stones, depth in POSITIONS:
+        ai = AI(symmetry=symmetry)
+        ai.max_time = 3600
+        start = time.perf_counter()
+        for sym in range(8):
+            board = oriented(size, stones, sym)
+            ai.transposition_table.new_search()
+            ai.prepare_board(board)
+            ai.search(board, depth, ai.max_time)
+        results.append((size, len(stones), ai.transposition_table.hit_rate(), ai.nodes,
+                        time.perf_counter() - start))
+    return results
+
+
+def book_hit_rate(book_cls, rng):
+    # Sách được dựng từ các khai cuộc 2-3 quân ở một hướng, rồi tra các khai cuộc đó ở hướng ngẫu nhiên
+    rates = {}
+    for size in (5, 7):
+        center = size // 2
+        near = [(r, c) for r in range(center - 1, center + 2) for c in range(center - 1, center + 2)]
+        openings = []
+        for _ in range(40):
+            cells = rng.sample(near, rng.choice((2, 3)))
+            openings.append([(r, c, 1 + i % 2) for i, (r, c) in enumerate(cells)])
+        book = book_cls()
+        for stones in openings:
+            board = oriented(size, stones, 0)
+            book.add(board, [move for move in near if board.empty_sqr(*move)][:2])
+        for stones in openings:
+            book.lookup(oriented(size, stones, rng.randrange(8)))
+        rates[size] = book.stats()["hit_rate"]
+    return rates
+
+
+def main():
+    plain, canonical = tt_hit_rate(False), tt_hit_rate(True)
+    for (size, stones, plain_rate, plain_nodes, plain_time), (_, _, rate, nodes, elapsed) in zip(plain, canonical):
+        print(f"{size}x{size} {stones} quân, 8 hướng: TT trúng {plain_rate:.3f} -> {rate:.3f} "
+              f"({rate / plain_rate if plain_rate else float('inf'):.1f}x), nút {plain_nodes} -> {nodes}, "
+              f"thời gian {plain_time:.2f}s -> {elapsed:.2f}s")
+    raw = book_hit_rate(RawBook, random.Random(3))
+    canon = book_hit_rate(OpeningBook, random.Random(3))
+    for size in raw:
+        print(f"{size}x{size} sách khai cuộc trúng {raw[size]:.3f} -> {canon[size]:.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+import random
+import time
+
+from caro_engine import Board, AI
+
+# So sánh chấm điểm cửa sổ bằng vòng lặp Python và bằng NumPy (vector_eval).
+# Mốc so sánh là đường vô hướng đã dùng bảng tra (user-017). Đo trên máy phát triển (1 nhân):
+# 11x11 nhanh khoảng 6-7x (evaluate_sequences) và 4-6x (evaluate_potential_advantages);
+# 5x5 / 7x7 chỉ 1.1-1.8x vì chi phí cố định của NumPy chiếm phần lớn.
+SIZES = [5, 7, 11]
+POSITIONS = 100 # Số thế cờ ngẫu nhiên cho mỗi kích thước
+
+
+def random_board(size, rng):
+    board = Board(size)
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+    for i, (row, col) in enumerate(cells[:rng.randint(0, size * size)]):
+        board.mark_sqr(row, col, 1 + i % 2)
+    return board
+
+
+def calls_per_sec(ai, boards, method):
+    start = time.perf_counter()
+    for board in boards:
+        method(board, ai.player)
+    return len(boards) / (time.perf_counter() - start)
+
+
+def main():
+    rng = random.Random(2)
+    scalar, vector = AI(vectorized=False), AI(vectorized=True)
+    print(f"{'size':>5} {'function':>30} {'scalar/s':>10} {'numpy/s':>10} {'speedup':>8}")
+    for size in SIZES:
+        boards = [random_board(size, rng) for _ in range(POSITIONS)]
+        # Hai cách tính phải cho cùng kết quả
+        for board in boards:
+            for player in (1, 2):
+                assert scalar.evaluate_sequences(board, player) == vector.evaluate_sequences(board, player)
+                assert scalar.evaluate_potential_advantages(board, player) == vector.evaluate_potential_advantages(board, player)
+        for name in ("evaluate_sequences", "evaluate_potential_advantages"):
+            slow = calls_per_sec(scalar, boards, getattr(scalar, name))
+            fast = calls_per_sec(vector, boards, getattr(vector, name))
+            print(f"{size:>5} {name:>30} {slow:>10.0f} {fast:>10.0f} {fast / slow:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+from candidates import CandidateSet
+from transposition import zobrist_keys
+from symmetry import symmetric_zobrist, canonical
+
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1)] # Cùng thứ tự hướng với Board.final_state
+
+
+class BitBoard:
+    # Bàn cờ dùng bitboard: mỗi người chơi một số nguyên, ô (r, c) là bit r * width + c.
+    # Mỗi hàng có thêm một cột đệm (luôn bằng 0) để phép dịch bit không tràn sang hàng kế tiếp.
+    def __init__(self, size, candidate_radius=2):
+        self.size = size # Kích thước bàn cờ (NxN)
+        self.width = size + 1 # Số bit mỗi hàng (gồm cột đệm)
+        self.bits = [0, 0, 0] # bits[1], bits[2]: các ô của người chơi 1 và 2
+        self.marked_sqrs = 0 # Số ô đã được đánh dấu
+        self.max_item_win = 3 if size == 5 else 5 # Điều kiện thắng giống Board
+        self.winning_line = None # Để lưu đường thắng
+        # Mặt nạ các ô thật trên bàn cờ (không gồm cột đệm)
+        row_mask = (1 << size) - 1
+        self.full_mask = 0
+        for r in range(size):
+            self.full_mask |= row_mask << (r * self.width)
+        # Độ dịch bit tương ứng với từng hướng (dọc, ngang, chéo phải, chéo trái)
+        self.shifts = [dr * self.width + dc for dr, dc in DIRECTIONS]
+        self.zobrist = zobrist_keys(size) # Cùng khóa Zobrist với Board để dùng chung bảng chuyển vị
+        self.hash = 0
+        self.sym_zobrist = symmetric_zobrist(size) # Khóa Zobrist qua 8 phép đối xứng giống Board
+        self.sym_hashes = [0] * 8
+        self.evaluator = None
+        self.candidates = CandidateSet(size, candidate_radius)
+        self._grid = None # Bản sao dạng danh sách của bàn cờ, tạo lại khi có nước đi mới
+
+    @property
+    def squares(self):
+        # Chỉ đọc: trả về danh sách lồng nhau để AI vẫn dùng được board.squares[r][c]
+        if self._grid is None:
+            self._grid = [[self.get(r, c) for c in range(self.size)] for r in range(self.size)]
+        return self._grid
+
+    def canonical_hash(self):
+        return canonical(self.sym_hashes)
+
+    def grid(self):
+        # Cùng giao diện với Board.grid (squares đã là danh sách lồng nhau)
+        return self.squares
+
+    def index(self, row, col):
+        return row * self.width + col
+
+    def get(self, row, col):
+        bit = 1 << (row * self.width + col)
+        if self.bits[1] & bit:
+            return 1
+        if self.bits[2] & bit:
+            return 2
+        return 0
+
+    def run_starts(self, player, shift, length):
+        # Bit i được bật khi có `length` quân liên tiếp bắt đầu từ ô i theo độ dịch `shift`
+        b = self.bits[player]
+        m = b
+        for j in range(1, length):
+            m &= b >> (j * shift)
+            if not m:
+                break
+        return m
+
+    def final_state(self, marked_row, marked_col):
+        player = self.get(marked_row, marked_col)
+        if player == 0:
+            return 0
+        k = self.max_item_win
+        idx = self.index(marked_row, marked_col)
+        for shift in self.shifts:
+            starts = self.run_starts(player, shift, k)
+            if not starts:
+                continue
+            # Duyệt điểm bắt đầu từ xa đến gần giống thứ tự delta của Board.final_state
+            for j in range(k - 1, -1, -1):
+                start = idx - j * shift
+                if start >= 0 and (starts >> start) & 1:
+                    end = start + (k - 1) * shift
+                    self.winning_line = (divmod(start, self.width), divmod(end, self.width))
+                    return player
+        return 0
+
+    def has_win(self, player):
+        # Kiểm tra người chơi đã có đủ max_item_win quân liên tiếp ở bất kỳ đâu
+        return any(self.run_starts(player, shift, self.max_item_win) for shift in self.shifts)
+
+    def mark_sqr(self, row, col, player):
+        self.bits[player] |= 1 << (row * self.width + col)
+        self.marked_sqrs += 1
+        self.hash ^= self.zobrist[row * self.size + col][player]
+        keys = self.sym_zobrist[row * self.size + col][player]
+        self.sym_hashes = [h ^ k for h, k in zip(self.sym_hashes, keys)]
+        if self.evaluator is not None:
+            self.evaluator.update(row, col, player, 1)
+        self.candidates.mark(row, col, self.empty_sqr)
+        self._grid = None
+
+    def unmake_sqr(self, row, col):
+        player = self.get(row, col)
+        self.hash ^= self.zobrist[row * self.size + col][player]
+        keys = self.sym_zobrist[row * self.size + col][player]
+        self.sym_hashes = [h ^ k for h, k in zip(self.sym_hashes, keys)]
+        if self.evaluator is not None:
+            self.evaluator.update(row, col, player, -1)
+        bit = 1 << (row * self.width + col)
+        self.bits[1] &= ~bit
+        self.bits[2] &= ~bit
+        self.marked_sqrs -= 1
+        self.candidates.unmark(row, col)
+        self.winning_line = None
+        self._grid = None
+
+    def empty_sqr(self, row, col):
+        return not ((self.bits[1] | self.bits[2]) >> (row * self.width + col)) & 1
+
+    def empty_mask(self):
+        return self.full_mask & ~(self.bits[1] | self.bits[2])
+
+    def get_empty_sqrs(self):
+        sqrs = []
+        empty = self.empty_mask()
+        while empty:
+            low = empty & -empty
+            sqrs.append(divmod(low.bit_length() - 1, self.width))
+            empty ^= low
+        return sqrs
+
+    def is_full(self):
+        return self.marked_sqrs == self.size * self.size
+
+    def longest_sequence(self, player):
+        # Board.longest_sequence chỉ đếm trong cửa sổ 2 * max_item_win - 1 ô nên giới hạn tương tự
+        if not self.bits[player]:
+            return 0
+        cap = 2 * self.max_item_win - 1
+        longest = 1
+        for shift in self.shifts:
+            m = self.bits[player]
+            length = 1
+            while length < cap:
+                m &= m >> shift
+                if not m:
+                    break
+                length += 1
+            longest = max(longest, length)
+        return longest
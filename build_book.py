@@ -0,0 +1,91 @@
+import argparse
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from caro_engine import Board, AI
+from opening_book import BOOK_PATH, BOOK_PLIES, write_book
+from symmetry import to_canonical
+
+# Sinh sách khai cuộc nhị phân (opening_book.bin) ngoài giờ chơi: duyệt cây khai cuộc từ bàn trống, mỗi thế cờ
+# được tìm kiếm sâu cho bên đang đi; nước tốt nhất cùng vài nước đứng đầu theo thứ tự sắp xếp của AI
+# (các khai cuộc thường gặp) được mở rộng tiếp tới `plies` quân. Thế cờ trùng nhau qua phép xoay/lật
+# chỉ được tìm một lần nhờ khóa chuẩn.
+
+
+def build_board(size, stones):
+    board = Board(size)
+    for row, col, player in stones:
+        board.mark_sqr(row, col, player)
+    return board
+
+
+def analyse(task):
+    # Tìm kiếm một thế cờ trong tiến trình con; trả về bản ghi sách và các nước để mở rộng cây
+    size, stones, max_depth, max_time, branching = task
+    board = build_board(size, stones)
+    player = 1 if len(stones) % 2 == 0 else 2
+    ai = AI(player=player)
+    ai.max_time = max_time
+    ai.prepare_board(board)
+    result = ai.search(board, max_depth, max_time)
+    move = result["best_move"]
+    score = result["score"] if result["score"] is not None and math.isfinite(result["score"]) else 0
+    key, sym = board.canonical_hash()
+    row, col = to_canonical(move, sym, size)
+    record = (key, size, player, row, col, result["depth"], score)
+    ordered = ai.move_orderer.order(board, ai.candidate_moves(board), 0, None, player)
+    children = [move] + [other for other in ordered if other != move][:branching - 1]
+    return record, player, children, ai.nodes
+
+
+def first_moves(size):
+    # Bàn trống: mọi nước có điểm 0 nên không tìm kiếm; sách đi vào tâm và mở rộng các ô quanh tâm
+    center = size // 2
+    return [(r, c) for r in range(center - 1, center + 2) for c in range(center - 1, center + 2)]
+
+
+def generate(sizes, plies, max_depth, max_time, branching, workers):
+    records = []
+    with ProcessPoolExecutor(workers) as pool:
+        for size in sizes:
+            start = time.perf_counter()
+            center = size // 2
+            records.append((build_board(size, []).canonical_hash()[0], size, 1, center, center, 0, 0))
+            seen = set()
+            layer = [[(row, col, 1)] for row, col in first_moves(size)]
+            nodes = 0
+            for _ in range(1, plies):
+                tasks = []
+                for stones in layer:
+                    key = build_board(size, stones).canonical_hash()[0]
+                    if key not in seen:
+                        seen.add(key)
+                        tasks.append((size, stones, max_depth, max_time, branching))
+                next_layer = []
+                for task, (record, player, children, searched) in zip(tasks, pool.map(analyse, tasks)):
+                    records.append(record)
+                    nodes += searched
+                    next_layer.extend(task[1] + [(row, col, player)] for row, col in children)
+                layer = next_layer
+            print(f"{size}x{size}: {len(seen) + 1} thế cờ, {nodes} nút, {time.perf_counter() - start:.1f}s")
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sinh sách khai cuộc nhị phân bằng tìm kiếm sâu")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 7, 11])
+    parser.add_argument("--plies", type=int, default=BOOK_PLIES, help="Sách gồm các thế cờ có ít hơn số quân này")
+    parser.add_argument("--depth", type=int, default=8, help="Độ sâu tìm kiếm tối đa mỗi thế cờ")
+    parser.add_argument("--time", type=float, default=1.5, help="Thời gian tìm kiếm mỗi thế cờ (giây)")
+    parser.add_argument("--branching", type=int, default=3, help="Số nước được mở rộng ở mỗi thế cờ")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=BOOK_PATH)
+    args = parser.parse_args()
+    records = generate(args.sizes, args.plies, args.depth, args.time, args.branching, args.workers)
+    write_book(args.output, records)
+    print(f"Đã ghi {len(records)} thế cờ vào {args.output}")
+
+
+if __name__ == '__main__':
+    main()
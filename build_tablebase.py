@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from opening_book import BinaryBook, write_book
+from solver import Solver, CELLS, FULL, WIN, TABLEBASE_PATH, TABLEBASE_PLIES, canonical_pair, has_line, position_key
+from symmetry import to_canonical
+
+# Dựng bảng tra hoàn hảo (tablebase) cho bàn 5x5: giải chính xác mọi thế cờ (khác nhau qua phép xoay/lật)
+# có ít hơn `plies` quân, quân 1 đi trước. Thế cờ được chia thành các phần giải song song trên nhiều tiến trình;
+# mỗi phần xong được ghi ngay vào thư mục tạm nên chạy lại sẽ bỏ qua các phần đã có (tiếp tục được khi bị dừng).
+# Tệp kết quả cùng định dạng với sách khai cuộc (opening_book.BinaryBook): điểm là giá trị lý thuyết
+# (WIN - d thắng sau d nước, âm nếu thua, 0 hòa), độ sâu là d.
+
+
+def positions(plies):
+    # Các thế cờ chưa kết thúc (quân 1, quân 2) theo thứ tự cố định, mỗi lớp đối xứng một đại diện
+    result = []
+    layer = [(0, 0)]
+    for stones in range(plies):
+        result.extend(layer)
+        if stones + 1 == plies:
+            break
+        seen = set()
+        next_layer = []
+        for p1, p2 in layer:
+            empty = FULL & ~(p1 | p2)
+            for cell in range(CELLS):
+                if empty >> cell & 1:
+                    child = (p1 | 1 << cell, p2) if stones % 2 == 0 else (p1, p2 | 1 << cell)
+                    if has_line(child[0]) or has_line(child[1]):
+                        continue
+                    key = canonical_pair(*child)
+                    if key not in seen:
+                        seen.add(key)
+                        next_layer.append(key)
+        layer = sorted(next_layer)
+    return result
+
+
+def solve_chunk(task):
+    # Giải một phần trong tiến trình con (dùng chung bảng ghi nhớ trong phần); trả về bản ghi, số nút, thời gian
+    index, chunk = task
+    start = time.perf_counter()
+    solver = Solver()
+    records = []
+    for p1, p2 in chunk:
+        player = 1 if bin(p1 | p2).count("1") % 2 == 0 else 2
+        me, opp = (p1, p2) if player == 1 else (p2, p1)
+        value, cell = solver.solve(me, opp)
+        key, sym = position_key(p1, p2)
+        row, col = to_canonical(divmod(cell, 5), sym, 5)
+        records.append((key, 5, player, row, col, WIN - abs(value) if value else 0, value))
+    return index, records, solver.nodes, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dựng bảng tra hoàn hảo cho bàn 5x5")
+    parser.add_argument("--plies", type=int, default=TABLEBASE_PLIES, help="Gồm các thế cờ có ít hơn số quân này")
+    parser.add_argument("--chunk", type=int, default=500, help="Số thế cờ mỗi phần")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=TABLEBASE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    parts_dir = args.output + ".parts"
+    os.makedirs(parts_dir, exist_ok=True)
+    progress_path = os.path.join(parts_dir, "progress.json")
+    progress = {}
+    if os.path.exists(progress_path):
+        with open(progress_path) as f:
+            progress = json.load(f)
+    if progress.get("plies", args.plies) != args.plies or progress.get("chunk", args.chunk) != args.chunk:
+        raise SystemExit(f"{parts_dir} được dựng với tham số khác; xóa thư mục này để dựng lại")
+    progress.update(plies=args.plies, chunk=args.chunk)
+    done = progress.setdefault("chunks", {}) # Chỉ số phần -> [số nút, thời gian giải]
+
+    todo = positions(args.plies)
+    chunks = [todo[i:i + args.chunk] for i in range(0, len(todo), args.chunk)]
+    tasks = [(index, chunk) for index, chunk in enumerate(chunks) if str(index) not in done]
+    print(f"{len(todo)} thế cờ, {len(chunks)} phần, còn {len(tasks)} phần cần giải")
+    with ProcessPoolExecutor(args.workers) as pool:
+        for future in as_completed([pool.submit(solve_chunk, task) for task in tasks]):
+            index, records, nodes, elapsed = future.result()
+            write_book(os.path.join(parts_dir, f"{index:05d}.bin"), records)
+            done[str(index)] = [nodes, elapsed]
+            with open(progress_path + ".tmp", "w") as f:
+                json.dump(progress, f)
+            os.replace(progress_path + ".tmp", progress_path) # Bị dừng giữa chừng cũng không hỏng tệp tiến độ
+            print(f"phần {index}: {len(records)} thế cờ, {nodes} nút, {elapsed:.1f}s")
+
+    records = []
+    for index in range(len(chunks)):
+        part = BinaryBook(os.path.join(parts_dir, f"{index:05d}.bin"))
+        records.extend(part.record(i) for i in range(part.count))
+        part.close()
+    write_book(args.output, records)
+    stats = {
+        "positions": len(records),
+        "plies": args.plies,
+        "bytes": os.path.getsize(args.output),
+        "nodes": sum(nodes for nodes, _ in done.values()),
+        "solve_seconds": round(sum(elapsed for _, elapsed in done.values()), 2),
+        "wall_seconds": round(time.perf_counter() - start, 2), # Chỉ lần chạy cuối
+        "workers": args.workers or os.cpu_count(),
+    }
+    with open(os.path.splitext(args.output)[0] + ".json", "w") as f:
+        json.dump(stats, f, indent=2)
+    print(json.dumps(stats))
+
+
+if __name__ == '__main__':
+    main()
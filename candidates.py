@@ -0,0 +1,56 @@
+_neighbor_cache = {}
+
+
+def neighbor_table(size, radius):
+    # neighbors[r * size + c]: các ô trong bán kính `radius` quanh (r, c), không gồm chính ô đó
+    table = _neighbor_cache.get((size, radius))
+    if table is None:
+        table = tuple(
+            tuple(
+                (r, c)
+                for r in range(max(0, row - radius), min(size, row + radius + 1))
+                for c in range(max(0, col - radius), min(size, col + radius + 1))
+                if (r, c) != (row, col)
+            )
+            for row in range(size) for col in range(size)
+        )
+        _neighbor_cache[(size, radius)] = table
+    return table
+
+
+class CandidateSet:
+    # Tập các ô trống nằm trong bán kính `radius` (theo cả 8 hướng) quanh ít nhất một quân cờ.
+    # near[i] đếm số quân trong vùng lân cận của ô i, nên hoàn tác nước đi khôi phục đúng tập cũ.
+    def __init__(self, size, radius=2):
+        self.size = size
+        self.radius = radius
+        self.near = [0] * (size * size)
+        self.cells = set()
+        self.neighbors = neighbor_table(size, radius) # Dùng chung giữa các bàn cờ cùng kích thước
+
+    def mark(self, row, col, empty_sqr):
+        # Gọi sau khi ô (row, col) được đánh dấu; `empty_sqr` là Board.empty_sqr
+        self.cells.discard((row, col))
+        near = self.near
+        for r, c in self.neighbors[row * self.size + col]:
+            near[r * self.size + c] += 1
+            if empty_sqr(r, c):
+                self.cells.add((r, c))
+
+    def unmark(self, row, col):
+        # Gọi sau khi ô (row, col) được hoàn tác về trống
+        near = self.near
+        for r, c in self.neighbors[row * self.size + col]:
+            i = r * self.size + c
+            near[i] -= 1
+            if near[i] == 0:
+                self.cells.discard((r, c))
+        if near[row * self.size + col] > 0:
+            self.cells.add((row, col))
+
+    def sorted(self):
+        # Cùng thứ tự theo hàng như Board.get_empty_sqrs để kết quả tìm kiếm ổn định
+        return sorted(self.cells)
+
+    def __len__(self):
+        return len(self.cells)
@@ -0,0 +1,792 @@
+import random
+import time
+
+from candidates import CandidateSet
+from move_ordering import MoveOrderer
+from pattern_eval import evaluator_for, WIN_SCORE
+from pattern_tables import DIRECTIONS, OPEN_THREE, line_tables, line_code, window_code, position_score
+from threat_search import ThreatSearch
+from search_control import SearchControl
+from instrumentation import PhaseTimer, counters, decision_stats, emit
+from transposition import TranspositionTable, zobrist_keys, flip_bound, SIDE_KEY, EXACT, LOWER, UPPER
+from symmetry import symmetric_zobrist, canonical, to_canonical, from_canonical
+from eval_cache import EvalCache
+from opening_book import OpeningBook, BOOK_PATH, BOOK_PLIES, load_book
+from solver import Solver, SOLVE_NODES, TABLEBASE_PATH, board_bits
+from sparse_board import SparseBoard
+
+# Lõi trò chơi (bàn cờ, đánh giá, tìm kiếm) không phụ thuộc giao diện: dùng được khi chạy hàng loạt,
+# trên máy chủ hoặc trong tiến trình con mà không cần tkinter / màn hình.
+# Các thư viện nặng (numpy, đa tiến trình, luồng suy nghĩ trước) chỉ được nạp khi thực sự cần.
+
+ASPIRATION_WINDOW = 1200 # Nửa độ rộng cửa sổ khát vọng quanh điểm của độ sâu trước
+ASPIRATION_MIN_DEPTH = 3 # Dùng cửa sổ khát vọng từ độ sâu này trở đi
+CACHE_MIN_DEPTH = 2 # Chỉ lưu vào bộ nhớ đệm trên đĩa các lần tìm kiếm đạt ít nhất độ sâu này
+EVAL_CACHE_MB = 4 # Giới hạn bộ nhớ mặc định của bộ nhớ đệm điểm lá
+CACHE_TRUST_DEPTH = 6 # Mục trong bộ nhớ đệm đạt độ sâu này được dùng ngay, không tìm lại
+SPARSE_MIN_SIZE = 15 # Bàn từ cỡ này trở lên dùng SparseBoard (xem new_board)
+
+class Board:
+    def __init__(self, size, candidate_radius=2):
+        self.size = size # Kích thước bàn cờ (NxN)
+        import numpy as np # Nạp trễ: chỉ cần khi tạo bàn cờ đầu tiên
+        self.squares = np.zeros((size, size), dtype=int) # Khởi tạo bàn cờ với các ô vuông giá trị 0
+        self.marked_sqrs = 0 # Số ô đã được đánh dấu
+        self.max_item_win = 3 if size == 5 else 5 # Điều kiện thắng (3 liên tiếp cho 5x5, 5 liên tiếp cho các kích thước khác)
+        self.winning_line = None # Để lưu đường thắng
+        self.zobrist = zobrist_keys(size) # Khóa Zobrist cho từng ô và người chơi
+        self.hash = 0 # Khóa Zobrist của thế cờ hiện tại, cập nhật dần trong mark_sqr/unmake_sqr
+        # Khóa Zobrist của thế cờ qua 8 phép đối xứng (sym_hashes[0] == hash), dùng cho khóa chuẩn
+        self.sym_zobrist = symmetric_zobrist(size)
+        self.sym_hashes = [0] * 8
+        self.evaluator = None # PatternEvaluator gắn vào bàn cờ (nếu AI dùng đánh giá tăng dần)
+        self.candidates = CandidateSet(size, candidate_radius) # Các ô trống gần quân đã đánh (nước đi ứng viên)
+        self._grid = None # Bản sao dạng danh sách của bàn cờ (xem grid), tạo lại khi có nước đi mới
+
+    # Kiểm tra trạng thái kết thúc (thắng/thua) sau khi đánh một nước
+    def final_state(self, marked_row, marked_col):
+        directions = [(1, 0), (0, 1), (1, 1), (1, -1)] # Các hướng kiểm tra (dọc, ngang, chéo phải, chéo trái)
+        player = self.squares[marked_row][marked_col]  # Người chơi hiện tại
+
+        for dr, dc in directions: # Duyệt qua mỗi hướng để kiểm tra thắng
+            count = 0 # Khởi tạo biến đếm số ô liên tiếp
+            start = None
+            for delta in range(-self.max_item_win + 1, self.max_item_win):  # Duyệt qua khoảng giá trị từ -max_item_win + 1 đến max_item_win
+                r = marked_row + delta * dr  # Tính toán vị trí dọc
+                c = marked_col + delta * dc  # Tính toán vị trí ngang
+                if 0 <= r < self.size and 0 <= c < self.size:
+                    if self.squares[r][c] == player:
+                        if count == 0:
+                            start = (r, c)
+                        count += 1
+                        if count == self.max_item_win:
+                            self.winning_line = (start, (r, c))
+                            return player
+                    else:
+                        count = 0
+                        start = None
+                else:
+                    count = 0
+                    start = None
+        return 0
+
+    # Đánh dấu ô tại vị trí `row`, `col` với giá trị `player`
+    def mark_sqr(self, row, col, player):
+        self.squares[row][col] = player # Đánh dấu ô với người chơi
+        self.marked_sqrs += 1 # Tăng số ô đã đánh dấu
+        self.hash ^= self.zobrist[row * self.size + col][player] # Cập nhật khóa Zobrist
+        keys = self.sym_zobrist[row * self.size + col][player]
+        self.sym_hashes = [h ^ k for h, k in zip(self.sym_hashes, keys)]
+        if self.evaluator is not None:
+            self.evaluator.update(row, col, player, 1) # Chỉ cập nhật các cửa sổ đi qua ô này
+        self.candidates.mark(row, col, self.empty_sqr) # Thêm các ô trống lân cận, bỏ ô vừa đánh
+        self._grid = None
+
+    # Hoàn tác nước đi tại `row`, `col` (dùng khi AI tìm kiếm trên cùng một bàn cờ)
+    def unmake_sqr(self, row, col):
+        player = self.squares[row][col]
+        self.hash ^= self.zobrist[row * self.size + col][player] # Trả lại khóa Zobrist
+        keys = self.sym_zobrist[row * self.size + col][player]
+        self.sym_hashes = [h ^ k for h, k in zip(self.sym_hashes, keys)]
+        if self.evaluator is not None:
+            self.evaluator.update(row, col, player, -1)
+        self.squares[row][col] = 0 # Xóa dấu của ô
+        self.marked_sqrs -= 1 # Giảm số ô đã đánh dấu
+        self.candidates.unmark(row, col) # Khôi phục đúng tập ứng viên trước nước đi
+        self.winning_line = None # Đường thắng (nếu có) không còn đúng sau khi hoàn tác
+        self._grid = None
+
+    def canonical_hash(self):
+        # (khóa chuẩn chung cho cả 8 thế cờ xoay/lật, phép đối xứng đưa bàn cờ này về hướng chuẩn)
+        return canonical(self.sym_hashes)
+
+    def grid(self):
+        # Bàn cờ dạng danh sách lồng nhau: đọc từng ô nhanh hơn mảng NumPy (dùng cho các hàm tra bảng mẫu)
+        if self._grid is None:
+            self._grid = self.squares.tolist()
+        return self._grid
+
+    def empty_sqr(self, row, col):
+        return self.squares[row][col] == 0 # Tăng số ô đã đánh dấu
+
+    def get_empty_sqrs(self):
+        return [(r, c) for r in range(self.size) for c in range(self.size) if self.empty_sqr(r, c)] # Lấy danh sách các ô trống
+
+    def is_full(self):
+        return self.marked_sqrs == self.size * self.size # Kiểm tra bàn cờ có đầy không
+
+    # Kiểm tra người chơi đã thắng ở bất kỳ vị trí nào trên bàn cờ
+    def has_win(self, player):
+        for row in range(self.size):
+            for col in range(self.size):
+                if self.squares[row][col] == player:
+                    if self.final_state(row, col) == player:
+                        return True
+        return False
+
+    # Tính độ dài dây liên tiếp dài nhất của một người chơi trên bàn cờ
+    def longest_sequence(self, player):
+        longest = 0 # Độ dài lớn nhất của chuỗi
+        directions = [(1, 0), (0, 1), (1, 1), (1, -1)] # Các hướng có thể kiểm tra
+        for row in range(self.size):
+            for col in range(self.size):
+                if self.squares[row][col] == player:
+                    for dr, dc in directions:
+                        count = 0
+                        for delta in range(-self.max_item_win + 1, self.max_item_win):
+                            r = row + delta * dr
+                            c = col + delta * dc
+                            if 0 <= r < self.size and 0 <= c < self.size and self.squares[r][c] == player:
+                                count += 1
+                                longest = max(longest, count)
+                            else:
+                                count = 0
+        return longest
+
+def new_board(size):
+    # Bàn cờ cho kích thước `size`: Board cho bàn nhỏ, SparseBoard cho bàn lớn; size = 0 là bàn không giới hạn
+    if size == 0:
+        return SparseBoard()
+    if size >= SPARSE_MIN_SIZE:
+        return SparseBoard(size)
+    return Board(size)
+
+class AI:
+    def __init__(self, player=2, tt_size_mb=16, evaluator='pattern', vectorized=True, full_width_size=5,
+                 search='pvs', workers=1, ponder=False, symmetry=True, book_path=BOOK_PATH,
+                 tablebase_path=TABLEBASE_PATH, cache_path=None, eval_cache_mb=None, eval_cache_policy='2way'): # Số đại diện cho AI (thường là 2)
+        self.player = player 
+        self.opponent = 3 - player # Số đại diện cho đối thủ (thường là 1)
+        self.max_time = 5  # Giới hạn thời gian suy nghĩ (giây)
+        self.max_nodes = None # Giới hạn số nút mỗi lượt suy nghĩ (None = không giới hạn)
+        # Cách đánh giá lá: 'pattern' (đếm cửa sổ tăng dần, O(1)), 'window' (cùng điểm nhưng tính lại mọi cửa sổ
+        # bằng evaluate_sequences ở mỗi lá) hoặc 'scan' (duyệt toàn bộ bàn cờ theo evaluate_position)
+        self.evaluator = evaluator
+        # Chấm điểm cửa sổ bằng NumPy (vector_eval) thay cho vòng lặp từng ô trong evaluate_sequences
+        # và evaluate_potential_advantages (đánh giá 'window'); bàn cờ thưa luôn dùng vòng lặp / đánh giá tăng dần
+        self.vectorized = vectorized
+        # Bàn cờ có kích thước <= full_width_size được tìm trên mọi ô trống thay vì chỉ các ô ứng viên
+        self.full_width_size = full_width_size
+        # Bộ nhớ đệm điểm lá theo khóa Zobrist (giới hạn theo bộ nhớ, 'lru' / 'clock' / '2way'); 0 = tắt.
+        # Mặc định chỉ bật cho 'scan' và 'window': điểm của 'pattern' đã tính dần nên tra đệm không nhanh hơn
+        if eval_cache_mb is None:
+            eval_cache_mb = EVAL_CACHE_MB if evaluator in ('scan', 'window') else 0
+        self.eval_cache = EvalCache(int(eval_cache_mb * 1024 * 1024), eval_cache_policy) if eval_cache_mb else None
+        # Bảng chuyển vị để lưu trữ các trạng thái đã đánh giá (giữ lại giữa các nước đi của cùng một ván)
+        self.transposition_table = TranspositionTable(tt_size_mb)
+        # Bảng chuyển vị dùng khóa chuẩn theo 8 phép đối xứng: thế cờ xoay/lật của nhau dùng chung một mục
+        self.symmetry = symmetry
+        self.search_aborted = False # Đánh dấu lượt tìm kiếm bị dừng (hết thời gian / hết số nút / bị hủy)
+        self.move_orderer = MoveOrderer() # Sắp xếp nước đi: killer, bảng lịch sử, nước trong bảng chuyển vị
+        # Thuật toán tìm kiếm: 'pvs' (negamax principal variation search) hoặc 'minimax' (bản cũ)
+        self.search_mode = search
+        self.nodes = 0 # Tổng số nút đã duyệt
+        self.prev_pv = [] # Chuỗi nước đi chính (PV) của độ sâu trước, được xét đầu tiên ở độ sâu sau
+        self.last_search = None # Kết quả chi tiết của lần tìm kiếm gần nhất (PV, thời gian từng độ sâu)
+        # Số tiến trình tìm kiếm song song (chia nước đi ở gốc); 1 = tìm tuần tự trong tiến trình hiện tại
+        self.workers = workers
+        self.parallel = None
+        self.root_moves = None # Giới hạn các nước đi ở gốc (dùng khi chia việc cho các tiến trình)
+        # Tìm chuỗi thắng cưỡng bức bằng các nước tạo bốn/ba mở trước khi tìm kiếm tổng quát
+        self.threat_search = ThreatSearch()
+        # Suy nghĩ trong thời gian của người chơi (luồng nền), dừng khi người chơi đi
+        self.ponderer = None
+        if ponder:
+            from ponder import Ponderer
+            self.ponderer = Ponderer(self)
+        self.control = None # Điều khiển (hạn chót, số nút, cờ hủy) của lượt suy nghĩ đang chạy
+        self.last_eval_time = 0.0 # Thời gian của lần eval gần nhất (giây)
+        self.last_ponder_hit = False # Lần eval gần nhất có dùng kết quả suy nghĩ trước không
+        self.last_stats = None # Thống kê của quyết định gần nhất (thời gian từng giai đoạn, số nút, độ sâu...)
+        self.hooks = [] # Các hàm callback(event, data) nhận sự kiện "phase", "depth", "decision"
+        self.phase_timer = None
+        # opening_book cho các nước đi đầu tiên trên các kích thước bàn cờ khác nhau
+        self.opening_book = {
+            (5, 5): [(2, 2), (2, 3), (3, 2), (3, 3)],  # Các nước đi mở đầu cho bàn cờ 5x5
+            (7, 7): [(3, 3), (3, 4), (4, 3), (4, 4)]   # Các nước đi mở đầu cho bàn cờ 7x7
+        }
+        # Sách khai cuộc tra theo khóa chuẩn (bàn trống và thế cờ một quân, mọi hướng xoay/lật)
+        self.book = OpeningBook.from_lists(self.opening_book, Board)
+        # Sách khai cuộc sinh sẵn bằng tìm kiếm sâu (build_book.py), đọc qua mmap; None nếu chưa có tệp sách
+        self.binary_book = load_book(book_path) if book_path else None
+        self.book_plies = BOOK_PLIES # Tra sách sinh sẵn khi bàn cờ có ít hơn số quân này
+        # Bàn 5x5 được chơi hoàn hảo: tra bảng dựng sẵn (build_tablebase.py), ngoài bảng thì giải trực tiếp
+        self.tablebase = load_book(tablebase_path) if tablebase_path else None
+        self.perfect_play = True
+        # Bộ nhớ đệm kết quả tìm kiếm trên đĩa (SQLite), dùng chung giữa các ván / tiến trình; None = tắt
+        self.cache = None
+        if cache_path:
+            from search_cache import SearchCache
+            self.cache = SearchCache(cache_path)
+        self.cache_depth = CACHE_TRUST_DEPTH
+
+    def eval(self, main_board, use_ponder=True, control=None):
+        # Thời gian suy nghĩ được tính từ lúc eval bắt đầu; `control` cho phép hủy từ luồng khác
+        pondering = use_ponder and self.ponderer is not None
+        if pondering:
+            # Dừng hẳn luồng suy nghĩ trước trước khi đặt control / phase_timer / bộ đếm: lượt eval của luồng đó
+            # ghi đè các thuộc tính này và số nút của nó không được tính vào nước đi hiện tại
+            self.ponderer.stop()
+        if control is None:
+            control = SearchControl(self.max_time, self.max_nodes)
+        self.control = control
+        self.last_ponder_hit = False
+        before = counters(self)
+        timer = self.phase_timer = PhaseTimer(self.hooks)
+        move = None
+        if pondering:
+            # Dùng lại kết quả nếu người chơi đi đúng nước đã dự đoán
+            timer.enter("ponder")
+            move = self.ponderer.take(main_board)
+            self.last_ponder_hit = move is not None
+        if move is None:
+            move = self.choose_move(main_board, control)
+        timer.finish()
+        self.last_eval_time = control.elapsed()
+        self.last_stats = decision_stats(self, main_board, move, timer, control, before)
+        if self.hooks:
+            emit(self.hooks, "decision", self.last_stats)
+        return move
+
+    def eval_with_stats(self, main_board, control=None):
+        # Như eval nhưng trả về cả thống kê của quyết định: (nước đi, dict thống kê)
+        move = self.eval(main_board, control=control)
+        return move, self.last_stats
+
+    def add_hook(self, hook):
+        # hook(event, data) được gọi từ luồng đang tìm kiếm (có thể là luồng nền / luồng suy nghĩ trước)
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        if hook in self.hooks:
+            self.hooks.remove(hook)
+
+    def cancel(self):
+        # Hủy lượt suy nghĩ đang chạy (gọi được từ luồng khác): tìm kiếm dừng sau vài chục nút
+        # và eval trả về nước đi tốt nhất của độ sâu đã hoàn thành gần nhất
+        control = self.control
+        if control is not None:
+            control.cancel()
+
+    def start_pondering(self, board):
+        if self.ponderer is not None:
+            self.ponderer.start(board)
+
+    def stop_pondering(self):
+        if self.ponderer is not None:
+            self.ponderer.stop()
+
+    def choose_move(self, main_board, control):
+        # Mỗi bước được ghi thời gian riêng; bước cuối cùng được vào là nguồn của nước đi
+        timer = self.phase_timer
+        timer.enter("opening_book")
+        self.transposition_table.new_search() # Mục từ các nước đi trước được ưu tiên thay thế
+        self.move_orderer.new_search()
+        self.prepare_board(main_board)
+        if self.perfect_play and main_board.size == 5:
+            timer.enter("tablebase")
+            move = self.perfect_move(main_board)
+            if move:
+                return move
+            timer.enter("opening_book")
+        # Tra sách sinh sẵn trong book_plies nước đầu, rồi opening_book nếu ít hơn 2 nước đi đã được thực hiện
+        if self.binary_book is not None and main_board.marked_sqrs < self.book_plies:
+            entry = self.binary_book.probe(main_board, self.player)
+            if entry:
+                return entry[0]
+        if main_board.marked_sqrs < 2:
+            book_moves = self.book.lookup(main_board)
+            if book_moves:
+                return random.choice(book_moves)
+
+        empty_sqrs = main_board.get_empty_sqrs()
+        
+        # Quick evaluation for early game (Đánh giá nhanh cho giai đoạn đầu trò chơi khi còn nhiều ô trống bàn cờ)
+        timer.enter("quick_eval")
+        if main_board.marked_sqrs < 4:
+            return self.quick_eval(main_board, empty_sqrs)
+
+        # Check for immediate winning moves and blocks (Kiểm tra nước đi chiến thắng ngay lập tức và chặn đối thủ)
+        timer.enter("immediate")
+        moves = self.candidate_moves(main_board)
+        for row, col in moves:
+            if self.is_winning_move(main_board, row, col, self.player):
+                return (row, col)
+        for row, col in moves:
+            if self.is_winning_move(main_board, row, col, self.opponent):
+                return (row, col)
+
+        # Tìm chuỗi thắng cưỡng bức (liên tục tạo bốn / ba mở) trong giới hạn nút và thời gian
+        timer.enter("threat_search")
+        forced_win = self.threat_search.find_win(main_board, self.player, control)
+        if forced_win:
+            return forced_win[0]
+
+        # Check for open threes and other complex strategic positions (Kiểm tra các vị trí chiến lược phức tạp [ví dụ: tạo chuỗi ba mở])
+        timer.enter("strategic")
+        strategic_move = self.check_strategic_positions(main_board)
+        if strategic_move:
+            return strategic_move
+
+        # Use iterative deepening within time limit (Sử dụng tìm kiếm sâu dần trong giới hạn thời gian còn lại)
+        timer.enter("cache")
+        if self.cache is not None:
+            cached = self.warm_start(main_board)
+            if cached:
+                return cached
+
+        timer.enter("search")
+        move = self.iterative_deepening(main_board, 10, control.remaining(), control)
+        if self.cache is not None:
+            result = self.last_search
+            if result and result["score"] is not None and result["depth"] >= CACHE_MIN_DEPTH:
+                self.cache.store(main_board, self.player, move, result["score"], result["depth"])
+        return move
+
+    def warm_start(self, board):
+        # Thế cờ đã được phân tích đủ sâu: dùng ngay nước đi đã lưu; nếu chưa đủ sâu thì nạp kết quả cũ
+        # vào bảng chuyển vị để nước đi đó được xét đầu tiên
+        cached = self.cache.lookup(board, self.player)
+        if cached is None:
+            return None
+        move, score, depth = cached
+        if depth >= self.cache_depth:
+            return move
+        key, sym = self.tt_key(board, True)
+        self.transposition_table.store(key, depth, EXACT, score, to_canonical(move, sym, board.size))
+        return None
+
+    def perfect_move(self, board):
+        # Nước đi hoàn hảo trên bàn 5x5 (3 quân liên tiếp): tra bảng, nếu không có thì giải chính xác
+        # trong giới hạn SOLVE_NODES nút; None nếu vượt giới hạn (dùng tìm kiếm thường)
+        if self.tablebase is not None:
+            entry = self.tablebase.probe(board, self.player)
+            if entry:
+                return entry[0]
+        me, opp = board_bits(board.grid(), self.player)
+        result = Solver(SOLVE_NODES).solve(me, opp)
+        if result is None:
+            return None
+        return divmod(result[1], board.size)
+
+    def close(self):
+        # Hủy lượt suy nghĩ đang chạy, dừng luồng suy nghĩ trước và các tiến trình tìm kiếm song song (nếu có).
+        # stop_pondering chờ luồng suy nghĩ trước kết thúc rồi mới đóng bộ nhớ đệm; lượt eval chạy trong luồng khác
+        # (AIWorker) phải được chờ dừng trước khi gọi close (AIWorker.close)
+        self.cancel()
+        self.stop_pondering()
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+
+    def quick_eval(self, board, empty_sqrs):
+        # Đánh giá nhanh bằng cách chọn ô gần trung tâm nhất
+        center = board.size // 2 # Tâm bàn cờ
+        best_move = None
+        best_score = -float('inf')
+
+        for row, col in empty_sqrs:
+            # Tính điểm dựa trên khoảng cách Manhattan đến trung tâm
+            score = -(abs(row - center) + abs(col - center))  # Ưu tiên các nước gần tâm
+            if score > best_score:
+                best_score = score
+                best_move = (row, col)
+
+        return best_move
+
+    def is_winning_move(self, board, row, col, player):
+        # Kiểm tra xem nước đi có dẫn đến chiến thắng không (đánh thử rồi hoàn tác)
+        board.mark_sqr(row, col, player)
+        result = board.final_state(row, col) == player  #Kiểm tra nếu là nước thắng
+        board.unmake_sqr(row, col)
+        return result
+
+    def candidate_moves(self, board):
+        # Các ô trống gần quân đã đánh; bàn nhỏ (hoặc chưa có ứng viên) thì xét mọi ô trống
+        if board.size <= self.full_width_size or not board.candidates:
+            return board.get_empty_sqrs()
+        return board.candidates.sorted()
+
+    def check_strategic_positions(self, board):
+        for row, col in self.candidate_moves(board):
+            # Kiểm tra xem nước đi có tạo ra chuỗi ba mở cho AI không
+            if self.is_open_three(board, row, col, self.player):
+                return (row, col)
+            # Kiểm tra và chặn chuỗi ba mở của đối thủ
+            if self.is_open_three(board, row, col, self.opponent):
+                return (row, col)
+        return None
+
+    def is_open_three(self, board, row, col, player):
+        # Mẫu chuỗi ba mở: 0XXX0 (với X là quân của người chơi) trên đoạn line_code qua (row, col), tra bảng
+        classes = line_tables(board.max_item_win).classes
+        for dr, dc in DIRECTIONS:
+            length, code = line_code(board.grid(), board.size, row, col, dr, dc, board.max_item_win)
+            if classes[length][code][player] & OPEN_THREE:
+                return True
+        return False
+
+    def prepare_board(self, board):
+        # Gắn bộ đánh giá tăng dần vào bàn cờ ở lần đầu, sau đó chỉ cần đọc điểm đang chạy
+        # ('window' trên bàn cờ thưa cũng dùng bộ đánh giá tăng dần: không có mảng NumPy cho vector_eval)
+        if board.evaluator is None and (self.evaluator == 'pattern'
+                                        or (self.evaluator == 'window' and getattr(board, "sparse", False))):
+            board.evaluator = evaluator_for(board)
+
+    def evaluate_board(self, board):
+        # Điểm lá theo góc nhìn AI chỉ phụ thuộc vị trí quân nên được lưu theo khóa Zobrist của bàn cờ
+        cache = self.eval_cache
+        if cache is None:
+            return self.score_board(board)
+        score = cache.get(board.hash)
+        if score is None:
+            score = self.score_board(board)
+            cache.put(board.hash, score)
+        return score
+
+    def score_board(self, board):
+        if self.evaluator == 'window' and not getattr(board, "sparse", False):
+            # Cùng điểm với PatternEvaluator.score: tổng điểm cửa sổ cộng / trừ WIN_SCORE khi đã có năm quân
+            score = self.evaluate_sequences(board, self.player)
+            if self.check_win(board, self.player):
+                score += WIN_SCORE
+            if self.check_win(board, self.opponent):
+                score -= WIN_SCORE
+            return score
+        if self.evaluator in ('pattern', 'window'):
+            self.prepare_board(board)
+            return board.evaluator.score(self.player)
+        score = 0
+        if self.check_win(board, self.player):
+            score += 10000
+        if self.check_win(board, self.opponent):
+            score -= 10000
+        if getattr(board, "sparse", False):
+            # Bàn cờ thưa: chỉ duyệt các ô đã có quân
+            for (row, col), player in board.cells.items():
+                if player == self.player:
+                    score += self.evaluate_position(board, row, col, self.player)
+                else:
+                    score -= self.evaluate_position(board, row, col, self.opponent)
+            return score
+        for row in range(board.size):
+            for col in range(board.size):
+                if board.squares[row][col] == self.player:
+                    score += self.evaluate_position(board, row, col, self.player)
+                elif board.squares[row][col] == self.opponent:
+                    score -= self.evaluate_position(board, row, col, self.opponent)
+        return score
+
+    def evaluate_position(self, board, row, col, player):
+        # Tổng count ** 2 theo 4 hướng (đếm quân tới ô chặn đầu tiên trong 3 ô mỗi phía), tra bảng đoạn 7 ô
+        return position_score(board.grid(), board.size, row, col, player)
+
+    def check_win(self, board, player):
+        return board.has_win(player) # Board và BitBoard đều cung cấp has_win
+
+    def evaluate_sequences(self, board, player):
+        if self.vectorized and not getattr(board, "sparse", False):
+            from vector_eval import sequences_score
+            return sequences_score(board.squares, player, board.max_item_win)
+        score = 0
+        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
+        for row in range(board.size):
+            for col in range(board.size):
+                for dr, dc in directions:
+                    score += self.evaluate_direction(board, row, col, dr, dc, player)
+        return score
+
+    def evaluate_direction(self, board, row, col, dr, dc, player):
+        # Điểm cửa sổ max_win ô bắt đầu tại (row, col) theo hướng (dr, dc); cửa sổ ra ngoài bàn cờ được 0 điểm
+        code = window_code(board.grid(), board.size, row, col, dr, dc, board.max_item_win)
+        if code < 0:
+            return 0
+        return line_tables(board.max_item_win).windows[code][player]
+
+    def evaluate_potential_advantages(self, board, player):
+        if self.vectorized and not getattr(board, "sparse", False):
+            from vector_eval import potential_score
+            return potential_score(board.squares, player, board.max_item_win)
+        score = 0
+        opponent = 3 - player
+        for row in range(board.size):
+            for col in range(board.size):
+                if board.squares[row][col] == 0:
+                    score += self.evaluate_future_sequence(board, row, col, player)
+                    score -= self.evaluate_future_sequence(board, row, col, opponent)
+        return score
+
+    def evaluate_future_sequence(self, board, row, col, player):
+        # Điểm tiềm năng (50 / 10) của đoạn line_code qua ô trống (row, col) theo 4 hướng, tra bảng
+        potential = line_tables(board.max_item_win).potential
+        score = 0
+        for dr, dc in DIRECTIONS:
+            length, code = line_code(board.grid(), board.size, row, col, dr, dc, board.max_item_win)
+            score += potential[length][code][player]
+        return score
+
+    def iterative_deepening(self, board, max_depth, max_time, control=None):
+        if control is None:
+            control = SearchControl(max_time, self.max_nodes)
+        if self.workers > 1:
+            if self.parallel is None:
+                from parallel_search import ParallelSearch
+                self.parallel = ParallelSearch(self.workers)
+            self.last_search = self.parallel.search(self, board, max_depth, control.remaining(), control)
+            self.nodes += self.last_search["nodes"] # Số nút của các tiến trình con, để thống kê quyết định đếm đúng
+            return self.last_search["best_move"]
+        if self.search_mode == 'pvs':
+            return self.search(board, max_depth, max_time, control)["best_move"]
+        best_move = None
+        self.search_aborted = False
+        result = {"best_move": None, "score": None, "pv": [], "depth": 0, "depths": []}
+        for depth in range(1, max_depth + 1):
+            if control.check():
+                break
+            depth_start, nodes_start = time.time(), self.nodes
+            # Nước đi tốt nhất của độ sâu trước nằm trong bảng chuyển vị và được minimax xét đầu tiên
+            score, move = self.minimax(board, depth, -float('inf'), float('inf'), True, control)
+            if self.search_aborted:
+                # Độ sâu bị dừng giữa chừng: giữ nước đi của độ sâu đã hoàn thành gần nhất
+                best_move = best_move or move
+                break
+            if move:
+                best_move = move
+                result.update(score=score, depth=depth)
+            result["depths"].append({
+                "depth": depth,
+                "score": score,
+                "pv": [move] if move else [],
+                "nodes": self.nodes - nodes_start,
+                "time": time.time() - depth_start,
+            })
+            if self.hooks:
+                emit(self.hooks, "depth", result["depths"][-1])
+        result["best_move"] = best_move or self.fallback_move(board)
+        result["pv"] = [result["best_move"]] if result["best_move"] else []
+        result["time"] = control.elapsed()
+        self.last_search = result # minimax không giữ PV đầy đủ, chỉ nước đầu tiên
+        return result["best_move"]
+
+    def fallback_move(self, board):
+        # Bị dừng trước khi xong độ sâu đầu tiên: chọn nước đứng đầu theo thứ tự sắp xếp
+        moves = self.move_orderer.order(board, self.candidate_moves(board), 0, None, self.player)
+        return moves[0] if moves else None
+
+    def search(self, board, max_depth, max_time, control=None):
+        # Tìm kiếm sâu dần bằng PVS với cửa sổ khát vọng (aspiration window) dựa trên điểm của các độ sâu trước.
+        # Trả về nước đi tốt nhất, PV đầy đủ và thời gian/số nút của từng độ sâu đã hoàn thành.
+        if control is None:
+            control = SearchControl(max_time, self.max_nodes)
+        start_time = time.time()
+        self.search_aborted = False
+        self.prev_pv = []
+        result = {"best_move": None, "score": None, "pv": [], "depth": 0, "depths": []}
+        for depth in range(1, max_depth + 1):
+            if control.check():
+                break
+            depth_start, nodes_start = time.time(), self.nodes
+            # Điểm dao động theo chẵn/lẻ độ sâu nên cửa sổ lấy tâm là điểm của độ sâu cùng tính chẵn lẻ (depth - 2)
+            if depth < ASPIRATION_MIN_DEPTH or len(result["depths"]) < 2:
+                alpha, beta = -float('inf'), float('inf')
+            else:
+                center = result["depths"][-2]["score"]
+                alpha, beta = center - ASPIRATION_WINDOW, center + ASPIRATION_WINDOW
+            while True:
+                score, pv = self.negamax(board, depth, alpha, beta, self.player, control, 0, True)
+                if self.search_aborted:
+                    break
+                # Điểm nằm ngoài cửa sổ: mở rộng phía bị vượt và tìm lại
+                if score <= alpha:
+                    alpha = -float('inf')
+                elif score >= beta:
+                    beta = float('inf')
+                else:
+                    break
+            if self.search_aborted:
+                # Độ sâu đầu tiên chưa xong thì vẫn dùng nước tốt nhất tìm được
+                if result["best_move"] is None and pv:
+                    result["best_move"] = pv[0]
+                break
+            self.prev_pv = pv
+            result.update(best_move=pv[0] if pv else None, score=score, pv=pv, depth=depth)
+            result["depths"].append({
+                "depth": depth,
+                "score": score,
+                "pv": pv,
+                "nodes": self.nodes - nodes_start,
+                "time": time.time() - depth_start,
+            })
+            if self.hooks:
+                emit(self.hooks, "depth", result["depths"][-1])
+        if result["best_move"] is None:
+            result["best_move"] = self.fallback_move(board)
+        result["time"] = time.time() - start_time
+        self.last_search = result
+        return result
+
+    def negamax(self, board, depth, alpha, beta, player, control, ply=0, on_pv=False):
+        # Negamax PVS: điểm luôn theo góc nhìn của `player` (bên đang đi), trả về (điểm, PV)
+        self.nodes += 1
+        maximizing = player == self.player
+        if board.is_full() or control.tick():
+            if not board.is_full():
+                self.search_aborted = True
+            score = self.evaluate_board(board)
+            return (score if maximizing else -score), []
+        # Nút lá hoặc ván đã kết thúc (đã có max_item_win quân liên tiếp): không duyệt tiếp
+        if depth == 0 or (board.evaluator is not None and (board.evaluator.full[1] or board.evaluator.full[2])):
+            score = self.evaluate_board(board)
+            return (score if maximizing else -score), []
+
+        # Bảng chuyển vị lưu điểm theo góc nhìn AI (dùng chung với minimax), đổi dấu khi tới lượt đối thủ
+        key, sym = self.tt_key(board, maximizing)
+        entry = self.transposition_table.probe(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = from_canonical(entry.move, sym, board.size)
+            # Không cắt tỉa bằng bảng chuyển vị tại nút PV để giữ được PV đầy đủ
+            if entry.depth >= depth and beta - alpha == 1:
+                score, flag = entry.score, entry.flag
+                if not maximizing:
+                    score, flag = -score, flip_bound(flag)
+                if flag == EXACT or (flag == LOWER and score >= beta) or (flag == UPPER and score <= alpha):
+                    return score, [tt_move] if tt_move else []
+
+        # Nước đi trên PV của độ sâu trước được xét đầu tiên
+        pv_move = self.prev_pv[ply] if on_pv and ply < len(self.prev_pv) else None
+        moves = self.candidate_moves(board)
+        if ply == 0 and self.root_moves is not None:
+            moves = [move for move in moves if move in self.root_moves]
+        moves = self.move_orderer.order(board, moves, ply, pv_move or tt_move, player)
+
+        alpha_orig = alpha
+        best_score, best_pv = -float('inf'), []
+        for index, (row, col) in enumerate(moves):
+            child_on_pv = on_pv and (row, col) == pv_move
+            board.mark_sqr(row, col, player)
+            if index == 0:
+                score, child_pv = self.negamax(board, depth - 1, -beta, -alpha, 3 - player, control, ply + 1, child_on_pv)
+                score = -score
+            else:
+                # Tìm với cửa sổ rỗng, chỉ tìm lại với cửa sổ đầy đủ khi nước đi có thể tốt hơn PV
+                # (nút lá đã cho điểm chính xác nên không cần tìm lại)
+                score, child_pv = self.negamax(board, depth - 1, -alpha - 1, -alpha, 3 - player, control, ply + 1)
+                score = -score
+                if alpha < score < beta and depth > 1:
+                    # Điểm của lần tìm rỗng là cận dưới nên cửa sổ tìm lại bắt đầu ngay dưới điểm đó
+                    score, child_pv = self.negamax(board, depth - 1, -beta, -(score - 1), 3 - player, control, ply + 1)
+                    score = -score
+            board.unmake_sqr(row, col) # Hoàn tác thay vì sao chép bàn cờ
+            if score > best_score:
+                best_score, best_pv = score, [(row, col)] + child_pv
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self.move_orderer.cutoff((row, col), ply, depth, player, index)
+                break
+
+        if not self.search_aborted and best_pv:
+            if best_score <= alpha_orig:
+                flag = UPPER
+            elif best_score >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            move = to_canonical(best_pv[0], sym, board.size)
+            if maximizing:
+                self.transposition_table.store(key, depth, flag, best_score, move)
+            else:
+                self.transposition_table.store(key, depth, flip_bound(flag), -best_score, move)
+        return best_score, best_pv
+
+    def minimax(self, board, depth, alpha, beta, maximizing, control, ply=0):
+        self.nodes += 1
+        # Điều kiện dừng: bàn cờ đầy, hết thời gian / số nút hoặc bị hủy
+        if board.is_full() or control.tick():
+            if not board.is_full():
+                self.search_aborted = True # Kết quả từ đây không đủ tin cậy để lưu vào bảng chuyển vị
+            return self.evaluate_board(board), None
+
+        # Tra bảng chuyển vị (khóa gồm Zobrist của bàn cờ và lượt đi)
+        key, sym = self.tt_key(board, maximizing)
+        entry = self.transposition_table.probe(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = from_canonical(entry.move, sym, board.size)
+            if entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.score, tt_move
+                if entry.flag == LOWER:
+                    alpha = max(alpha, entry.score)
+                elif entry.flag == UPPER:
+                    beta = min(beta, entry.score)
+                if beta <= alpha:
+                    return entry.score, tt_move
+
+        # Điều kiện dừng: đạt độ sâu 0
+        if depth == 0:
+            score = self.evaluate_board(board)
+            self.transposition_table.store(key, 0, EXACT, score, None)
+            return score, None
+
+        alpha_orig, beta_orig = alpha, beta
+        mover = self.player if maximizing else self.opponent
+        # Sắp xếp các nước đi theo thứ tự ưu tiên để cắt tỉa alpha-beta hiệu quả hơn
+        # (nước trong bảng chuyển vị, thắng/chặn ngay, killer, lịch sử rồi mới đến điểm tĩnh)
+        empty_sqrs = self.move_orderer.order(board, self.candidate_moves(board), ply, tt_move, mover)
+
+        if maximizing:
+            max_eval = -float('inf')
+            best_move = None
+            for index, (row, col) in enumerate(empty_sqrs):
+                board.mark_sqr(row, col, self.player)
+                eval, _ = self.minimax(board, depth - 1, alpha, beta, False, control, ply + 1)
+                board.unmake_sqr(row, col) # Hoàn tác thay vì sao chép bàn cờ
+                if eval > max_eval:
+                    max_eval = eval
+                    best_move = (row, col)
+                alpha = max(alpha, eval)
+                if beta <= alpha:
+                    self.move_orderer.cutoff((row, col), ply, depth, mover, index)
+                    break # Cắt tỉa alpha
+            self.store_result(key, depth, max_eval, to_canonical(best_move, sym, board.size), alpha_orig, beta_orig)
+            return max_eval, best_move
+        else:
+            min_eval = float('inf')
+            best_move = None
+            for index, (row, col) in enumerate(empty_sqrs):
+                board.mark_sqr(row, col, self.opponent)
+                eval, _ = self.minimax(board, depth - 1, alpha, beta, True, control, ply + 1)
+                board.unmake_sqr(row, col) # Hoàn tác thay vì sao chép bàn cờ
+                if eval < min_eval:
+                    min_eval = eval
+                    best_move = (row, col)
+                beta = min(beta, eval)
+                if beta <= alpha:
+                    self.move_orderer.cutoff((row, col), ply, depth, mover, index)
+                    break # Cắt tỉa beta
+            self.store_result(key, depth, min_eval, to_canonical(best_move, sym, board.size), alpha_orig, beta_orig)
+            return min_eval, best_move
+
+    def tt_key(self, board, maximizing):
+        # Khóa bảng chuyển vị (Zobrist của thế cờ + lượt đi) và phép đối xứng để đổi nước đi về hướng chuẩn
+        if self.symmetry:
+            key, sym = board.canonical_hash()
+        else:
+            key, sym = board.hash, 0
+        return (key ^ SIDE_KEY if maximizing else key), sym
+
+    def store_result(self, key, depth, score, move, alpha, beta):
+        # Lưu kết quả vào bảng chuyển vị cùng loại giá trị so với cửa sổ (alpha, beta) ban đầu
+        if self.search_aborted:
+            return
+        if score <= alpha:
+            flag = UPPER
+        elif score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.transposition_table.store(key, depth, flag, score, move)
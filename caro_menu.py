@@ -1,12 +1,11 @@
 import tkinter as tk
 from tkinter import font as tkfont
-from caro import Game
 
 class CaroUI:
     def __init__(self, root):
         self.root = root
         self.root.title("010100085803-TRÍ TUỆ NHÂN TẠO-NHÓM 5")
-        self.root.geometry("500x450") # Đặt kích thước cửa sổ
+        self.root.geometry("500x490") # Đặt kích thước cửa sổ
         
         # Định nghĩa màu sắc
         self.bg_color = "#F5F5DC"  # Beige background color
@@ -38,6 +37,15 @@ class CaroUI:
         self.size5_radio.pack(side=tk.LEFT, padx=10)
         self.size7_radio.pack(side=tk.LEFT, padx=10)
         self.size11_radio.pack(side=tk.LEFT, padx=10)
+        # Bàn lớn và bàn không giới hạn (giá trị 0) dùng bàn cờ thưa
+        self.large_frame = tk.Frame(root, bg=self.bg_color)
+        self.large_frame.pack()
+        self.size15_radio = tk.Radiobutton(self.large_frame, text="15x15", variable=self.size_var, value=15, font=self.custom_font, fg=self.text_color, bg=self.bg_color, selectcolor=self.bg_color)
+        self.size19_radio = tk.Radiobutton(self.large_frame, text="19x19", variable=self.size_var, value=19, font=self.custom_font, fg=self.text_color, bg=self.bg_color, selectcolor=self.bg_color)
+        self.unbounded_radio = tk.Radiobutton(self.large_frame, text="Không giới hạn", variable=self.size_var, value=0, font=self.custom_font, fg=self.text_color, bg=self.bg_color, selectcolor=self.bg_color)
+        self.size15_radio.pack(side=tk.LEFT, padx=10)
+        self.size19_radio.pack(side=tk.LEFT, padx=10)
+        self.unbounded_radio.pack(side=tk.LEFT, padx=10)
         
         # Chọn chế độ chơi
         self.mode_label = tk.Label(root, text="Chọn chế độ chơi", font=self.custom_font, fg=self.text_color, bg=self.bg_color)
@@ -61,6 +69,7 @@ class CaroUI:
         size = self.size_var.get() 
         mode = self.mode_var.get()
         self.root.destroy()
+        from caro import Game # Nạp giao diện ván cờ (và lõi AI) khi bắt đầu chơi để menu mở nhanh
         game = Game(size=size, gamemode=mode)
         game.mainloop()
 
@@ -0,0 +1,53 @@
+import random
+
+from caro_engine import Board, AI
+from bitboard import BitBoard
+from pattern_eval import PatternEvaluator, full_score
+
+# Kiểm tra ngẫu nhiên: điểm của PatternEvaluator sau mọi chuỗi đánh dấu/hoàn tác
+# luôn bằng điểm tính lại từ đầu (full_score và điểm lá của AI(evaluator='window'), có và không có NumPy).
+SIZES = [5, 7, 11]
+GAMES = 30 # Số chuỗi nước đi ngẫu nhiên cho mỗi kích thước bàn cờ và mỗi loại bàn cờ
+STEPS = 80 # Số thao tác đánh dấu/hoàn tác trong mỗi chuỗi
+
+
+def from_scratch(ai, board, player):
+    # Điểm lá mà tìm kiếm nhận được từ đánh giá 'window' (tính lại mọi cửa sổ, không qua bộ nhớ đệm)
+    ai.player, ai.opponent = player, 3 - player
+    return ai.score_board(board)
+
+
+def check(board_cls, size, rng):
+    ais = [AI(evaluator='window', vectorized=vectorized, eval_cache_mb=0) for vectorized in (False, True)]
+    board = board_cls(size)
+    board.evaluator = PatternEvaluator(board)
+    played = []
+    for _ in range(STEPS):
+        if played and (board.is_full() or rng.random() < 0.35):
+            row, col = played.pop()
+            board.unmake_sqr(row, col)
+        else:
+            row, col = rng.choice(board.get_empty_sqrs())
+            board.mark_sqr(row, col, rng.choice((1, 2)))
+            played.append((row, col))
+        for player in (1, 2):
+            expected = full_score(board, player)
+            assert board.evaluator.score(player) == expected, (size, player, played)
+            for ai in ais:
+                assert from_scratch(ai, board, player) == expected, (size, player, ai.vectorized, played)
+        # Gắn một bộ đánh giá mới vào thế cờ hiện tại cũng phải cho cùng kết quả
+        fresh = PatternEvaluator(board)
+        assert fresh.running == board.evaluator.running and fresh.full == board.evaluator.full
+
+
+def main():
+    rng = random.Random(1)
+    for size in SIZES:
+        for board_cls in (Board, BitBoard):
+            for _ in range(GAMES):
+                check(board_cls, size, rng)
+            print(f"{size}x{size} {board_cls.__name__}: {GAMES} random sequences OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import random
+import time
+
+from caro_engine import Board, AI
+from bitboard import BitBoard
+from pattern_eval import window_score
+
+# Kiểm tra ngẫu nhiên: các hàm tra bảng của AI (pattern_tables) cho cùng kết quả với cách cũ
+# (cắt danh sách và đếm bằng list.count), đồng thời so sánh thời gian hai cách.
+SIZES = [5, 7, 11]
+BOARDS = 40 # Số thế cờ ngẫu nhiên cho mỗi kích thước và mỗi loại bàn cờ
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+# --- Cách cũ (danh sách) ---
+def get_line(board, row, col, dr, dc):
+    line = []
+    for i in range(-board.max_item_win + 1, board.max_item_win):
+        r, c = row + i * dr, col + i * dc
+        if 0 <= r < board.size and 0 <= c < board.size:
+            line.append(board.squares[r][c])
+        else:
+            break
+    return line
+
+
+def is_open_three(board, row, col, player):
+    pattern = [0, player, player, player, 0]
+    for dr, dc in DIRECTIONS:
+        line = get_line(board, row, col, dr, dc)
+        if pattern in [line[i:i + 5] for i in range(len(line) - 4)]:
+            return True
+    return False
+
+
+def evaluate_position(board, row, col, player):
+    score = 0
+    for dr, dc in DIRECTIONS:
+        count = 0
+        block_count = 0
+        for delta in range(-3, 4):
+            r = row + delta * dr
+            c = col + delta * dc
+            if 0 <= r < board.size and 0 <= c < board.size:
+                if board.squares[r][c] == player:
+                    count += 1
+                elif board.squares[r][c] != 0:
+                    block_count += 1
+                    break
+            else:
+                block_count += 1
+                break
+        if block_count < 2:
+            score += count ** 2
+    return score
+
+
+def evaluate_direction(board, row, col, dr, dc, player):
+    max_win = board.max_item_win
+    line = []
+    for i in range(max_win):
+        r, c = row + i * dr, col + i * dc
+        if 0 <= r < board.size and 0 <= c < board.size:
+            line.append(board.squares[r][c])
+        else:
+            break
+    if len(line) >= max_win:
+        return window_score(line.count(player), line.count(3 - player), max_win)
+    return 0
+
+
+def evaluate_future_sequence(board, row, col, player):
+    score = 0
+    max_win = board.max_item_win
+    for dr, dc in DIRECTIONS:
+        line = get_line(board, row, col, dr, dc)
+        player_count, empty_count = line.count(player), line.count(0)
+        if player_count == max_win - 2 and empty_count == 2:
+            score += 50
+        elif player_count == max_win - 3 and empty_count == 3:
+            score += 10
+    return score
+
+
+def random_board(board_cls, size, rng):
+    board = board_cls(size)
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    for row, col in rng.sample(cells, rng.randint(0, size * size * 2 // 3)):
+        board.mark_sqr(row, col, rng.choice((1, 2)))
+    return board
+
+
+def run_all(board, table_ai, use_tables):
+    # Gọi mọi hàm trên mọi ô; trả về danh sách kết quả để so sánh hai cách
+    results = []
+    cells = [(r, c) for r in range(board.size) for c in range(board.size)]
+    for row, col in cells:
+        for player in (1, 2):
+            if use_tables:
+                results.append(table_ai.is_open_three(board, row, col, player))
+                results.append(table_ai.evaluate_position(board, row, col, player))
+                results.append(table_ai.evaluate_future_sequence(board, row, col, player))
+                results.extend(table_ai.evaluate_direction(board, row, col, dr, dc, player) for dr, dc in DIRECTIONS)
+            else:
+                results.append(is_open_three(board, row, col, player))
+                results.append(evaluate_position(board, row, col, player))
+                results.append(evaluate_future_sequence(board, row, col, player))
+                results.extend(evaluate_direction(board, row, col, dr, dc, player) for dr, dc in DIRECTIONS)
+    return results
+
+
+def main():
+    rng = random.Random(7)
+    ai = AI(vectorized=False)
+    for size in SIZES:
+        for board_cls in (Board, BitBoard):
+            boards = [random_board(board_cls, size, rng) for _ in range(BOARDS)]
+            run_all(boards[0], ai, True) # Dựng bảng trước khi đo
+            timings = []
+            for use_tables in (False, True):
+                start = time.perf_counter()
+                results = [run_all(board, ai, use_tables) for board in boards]
+                timings.append(time.perf_counter() - start)
+                if use_tables:
+                    assert results == expected, (size, board_cls.__name__)
+                else:
+                    expected = results
+            print(f"{size}x{size} {board_cls.__name__:>8}: khớp trên {BOARDS} thế cờ, "
+                  f"danh sách {timings[0]:.3f}s, tra bảng {timings[1]:.3f}s ({timings[0] / timings[1]:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
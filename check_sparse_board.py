@@ -0,0 +1,68 @@
+import random
+
+from caro_engine import Board, AI
+from pattern_eval import PatternEvaluator, SparsePatternEvaluator
+from sparse_board import SparseBoard
+
+# Kiểm tra ngẫu nhiên: SparseBoard cho cùng kết quả với Board (kiểm tra thắng, đường thắng, dãy dài nhất,
+# khóa Zobrist, tập ứng viên, điểm của bộ đánh giá tăng dần và nước đi của tìm kiếm), kể cả khi hoàn tác.
+SIZES = [5, 7, 11, 15, 19]
+GAMES = 20 # Số ván ngẫu nhiên cho mỗi kích thước
+
+
+def compare(dense, sparse):
+    assert dense.hash == sparse.hash and dense.canonical_hash() == sparse.canonical_hash()
+    assert dense.candidates.sorted() == sparse.candidates.sorted()
+    for player in (1, 2):
+        assert dense.has_win(player) == sparse.has_win(player)
+        assert dense.longest_sequence(player) == sparse.longest_sequence(player)
+        assert dense.evaluator.score(player) == sparse.evaluator.score(player)
+    assert dense.evaluator.full == sparse.evaluator.full
+
+
+def random_game(size, rng):
+    dense, sparse = Board(size), SparseBoard(size)
+    dense.evaluator, sparse.evaluator = PatternEvaluator(dense), SparsePatternEvaluator(sparse)
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    center = size // 2
+    cells.sort(key=lambda cell: abs(cell[0] - center) + abs(cell[1] - center) + rng.random() * 4)
+    moves = cells[:rng.randint(1, min(len(cells), 40))]
+    for i, (row, col) in enumerate(moves):
+        player = 1 + i % 2
+        dense.mark_sqr(row, col, player)
+        sparse.mark_sqr(row, col, player)
+        result = dense.final_state(row, col)
+        assert result == sparse.final_state(row, col), (size, moves[:i + 1])
+        if result:
+            assert dense.winning_line == sparse.winning_line
+        compare(dense, sparse)
+    # Hoàn tác một nửa số nước rồi so sánh lại
+    for row, col in reversed(moves[len(moves) // 2:]):
+        dense.unmake_sqr(row, col)
+        sparse.unmake_sqr(row, col)
+    compare(dense, sparse)
+    return dense, sparse
+
+
+def main():
+    rng = random.Random(5)
+    for size in SIZES:
+        for _ in range(GAMES):
+            dense, sparse = random_game(size, rng)
+        # Cùng thế cờ thì tìm kiếm ra cùng nước đi và điểm
+        ai_dense, ai_sparse = AI(), AI()
+        depth = 2 if size > 11 else 3
+        a = ai_dense.search(dense, depth, 3600)
+        b = ai_sparse.search(sparse, depth, 3600)
+        assert (a["best_move"], a["score"]) == (b["best_move"], b["score"]), (size, a["best_move"], b["best_move"])
+        print(f"{size}x{size}: khớp trên {GAMES} ván ngẫu nhiên, tìm kiếm độ sâu {depth}: {b['best_move']} {b['score']}")
+    # Bàn không giới hạn: thắng ở xa tâm vẫn được phát hiện
+    board = SparseBoard()
+    for i in range(5):
+        board.mark_sqr(1000 + i, 40000 - i, 1)
+    assert board.final_state(1004, 39996) == 1 and board.has_win(1)
+    print("Bàn không giới hạn: phát hiện thắng theo đường chéo ở xa tâm")
+
+
+if __name__ == '__main__':
+    main()
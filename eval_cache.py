@@ -0,0 +1,135 @@
+import sys
+from collections import OrderedDict
+
+# Bộ nhớ đệm điểm đánh giá lá: khóa Zobrist của thế cờ -> điểm (không giữ tham chiếu tới bàn cờ).
+# Số mục tối đa tính từ giới hạn bộ nhớ (byte) chia cho ước lượng số byte mỗi mục của từng cách thay thế:
+#   'lru'   OrderedDict, bỏ mục lâu không dùng nhất
+#   'clock' mảng cố định + bit tham chiếu, kim đồng hồ bỏ qua mục vừa được dùng (xấp xỉ LRU, không di chuyển mục)
+#   '2way'  mảng cố định chia nhóm 2 ô theo khóa, không cần dict; thay ô ít dùng gần đây hơn trong nhóm
+POLICIES = ("lru", "clock", "2way")
+
+_INT_BYTES = sys.getsizeof(2 ** 63) + sys.getsizeof(10 ** 4) # Khóa 64 bit và điểm
+_DICT_SLOT_BYTES = 3 * 8 * 3 // 2 # Ô dict (hash, khóa, giá trị) với hệ số lấp đầy ~2/3
+ENTRY_BYTES = {
+    "lru": _INT_BYTES + _DICT_SLOT_BYTES + 4 * 8, # Thêm nút danh sách liên kết của OrderedDict
+    "clock": _INT_BYTES + _DICT_SLOT_BYTES + sys.getsizeof(0) + 2 * 8 + 1, # Dict khóa -> chỉ số ô
+    "2way": _INT_BYTES + 2 * 8 + 1,
+}
+
+
+class EvalCache:
+    def __init__(self, max_bytes=4 * 1024 * 1024, policy="2way"):
+        if policy not in POLICIES:
+            raise ValueError(f"Cách thay thế không hợp lệ: {policy} (chọn một trong {', '.join(POLICIES)})")
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self.capacity = max(2, max_bytes // ENTRY_BYTES[policy])
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if policy == "lru":
+            self.entries = OrderedDict()
+        else:
+            if policy == "2way":
+                self.capacity -= self.capacity % 2
+            self.keys = [None] * self.capacity
+            self.scores = [0] * self.capacity
+            self.referenced = bytearray(self.capacity) # clock: bit tham chiếu; 2way: ô dùng gần đây trong nhóm
+            self.index = {} # clock: khóa -> chỉ số ô
+            self.hand = 0
+
+    def clear(self):
+        # Bỏ mọi mục (giữ nguyên dung lượng và bộ đếm)
+        if self.policy == "lru":
+            self.entries.clear()
+        else:
+            self.keys = [None] * self.capacity
+            self.referenced = bytearray(self.capacity)
+            self.index = {}
+            self.hand = 0
+
+    def get(self, key):
+        # Điểm đã lưu hoặc None
+        policy = self.policy
+        if policy == "2way":
+            slot = key % (self.capacity >> 1) << 1
+            if self.keys[slot] == key:
+                self.referenced[slot >> 1] = 0
+            elif self.keys[slot + 1] == key:
+                slot += 1
+                self.referenced[slot >> 1] = 1
+            else:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self.scores[slot]
+        if policy == "lru":
+            score = self.entries.get(key)
+            if score is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return score
+        slot = self.index.get(key)
+        if slot is None:
+            self.misses += 1
+            return None
+        self.referenced[slot] = 1
+        self.hits += 1
+        return self.scores[slot]
+
+    def put(self, key, score):
+        policy = self.policy
+        if policy == "2way":
+            bucket = key % (self.capacity >> 1)
+            slot = bucket << 1
+            if self.keys[slot] is not None and self.keys[slot] != key:
+                if self.keys[slot + 1] is None or self.keys[slot + 1] == key or self.referenced[bucket] == 0:
+                    slot += 1 # Ô 0 vừa được dùng: ghi vào ô 1
+            if self.keys[slot] is not None and self.keys[slot] != key:
+                self.evictions += 1
+            self.keys[slot] = key
+            self.scores[slot] = score
+            self.referenced[bucket] = slot & 1
+            return
+        if policy == "lru":
+            entries = self.entries
+            entries[key] = score
+            entries.move_to_end(key)
+            if len(entries) > self.capacity:
+                entries.popitem(last=False)
+                self.evictions += 1
+            return
+        slot = self.index.get(key)
+        if slot is None:
+            # Quay kim tới ô trống hoặc ô không được dùng từ vòng trước
+            while self.keys[self.hand] is not None and self.referenced[self.hand]:
+                self.referenced[self.hand] = 0
+                self.hand = (self.hand + 1) % self.capacity
+            slot = self.hand
+            self.hand = (self.hand + 1) % self.capacity
+            if self.keys[slot] is not None:
+                del self.index[self.keys[slot]]
+                self.evictions += 1
+            self.keys[slot] = key
+            self.index[key] = slot
+        self.scores[slot] = score
+        self.referenced[slot] = 1
+
+    def __len__(self):
+        if self.policy == "lru":
+            return len(self.entries)
+        return self.capacity - self.keys.count(None)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "policy": self.policy,
+            "capacity": self.capacity,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,302 @@
+import argparse
+import os
+import struct
+import sys
+import time
+
+from caro_engine import new_board
+
+# Biên bản ván cờ: danh sách nước đi kèm thời gian suy nghĩ và thống kê của AI, ghi nối tiếp vào một tệp lưu trữ
+# (mỗi ván ghi xong là ghi ngay, không phải viết lại cả tệp). Một ván là dict:
+#   {"size": kích thước (0 = không giới hạn), "result": 1 / 2 (người thắng), 0 (hòa) hoặc None (chưa xong),
+#    "start": thời điểm bắt đầu (giây unix), "moves": [(hàng, cột, ms, nút, độ sâu, điểm), ...]}
+# Quân 1 đi trước, các nước xen kẽ; nút / độ sâu / điểm là None với nước đi của người.
+#
+# Định dạng văn bản: mỗi ván một dòng "kích_thước kết_quả thời_điểm nước nước ...", kết quả '*' nếu chưa xong,
+# mỗi nước "hàng,cột:ms" hoặc "hàng,cột:ms:nút:độ_sâu:điểm" với nước của AI.
+# Định dạng nhị phân: RECORD_MAGIC, rồi mỗi ván là GAME_HEADER (kích thước, số nước, kết quả, thời điểm,
+# số byte phần nước đi) và các nước đi mã hóa bằng varint (7 bit mỗi byte): hàng, cột, ms * 2 + có_thống_kê,
+# rồi nút, độ sâu, điểm (zigzag) nếu có thống kê; thường 3-4 byte mỗi nước của người, 8-10 byte mỗi nước của AI.
+# Đầu ván có số byte nên lập chỉ mục chỉ cần nhảy qua phần nước đi mà không giải mã.
+# Hai định dạng được nhận dạng qua bốn byte đầu của tệp.
+RECORD_MAGIC = b"CRGR"
+GAME_HEADER = struct.Struct("<HHBII")
+UNFINISHED = 255 # Kết quả của ván chưa xong trong định dạng nhị phân
+SCORE_LIMIT = (1 << 31) - 1 # Điểm thắng/thua (vô cực) được ghi bằng giá trị lớn nhất của int32
+
+
+def new_game(size, start=None):
+    return {"size": size, "result": None, "start": time.time() if start is None else start, "moves": []}
+
+
+def add_move(game, row, col, ms, stats=None):
+    # `stats`: thống kê quyết định của AI (AI.last_stats) hoặc None với nước đi của người
+    if stats is None:
+        game["moves"].append((row, col, int(ms), None, None, None))
+    else:
+        game["moves"].append((row, col, int(ms), stats["nodes"], stats["depth"], clip_score(stats["score"])))
+
+
+def clip_score(score):
+    if score is None:
+        return 0
+    return int(max(-SCORE_LIMIT, min(SCORE_LIMIT, score)))
+
+
+def format_game(game):
+    result = "*" if game["result"] is None else str(game["result"])
+    tokens = [str(game["size"]), result, str(int(game["start"]))]
+    for row, col, ms, nodes, depth, score in game["moves"]:
+        if depth is None:
+            tokens.append(f"{row},{col}:{ms}")
+        else:
+            tokens.append(f"{row},{col}:{ms}:{nodes}:{depth}:{score}")
+    return " ".join(tokens)
+
+
+def parse_game(line):
+    # Ván từ một dòng văn bản, None với dòng trống
+    tokens = line.split()
+    if not tokens:
+        return None
+    game = new_game(int(tokens[0]), float(tokens[2]))
+    game["result"] = None if tokens[1] == "*" else int(tokens[1])
+    moves = game["moves"]
+    for token in tokens[3:]:
+        cell, *fields = token.split(":")
+        row, col = cell.split(",")
+        ms = int(fields[0]) if fields else 0
+        if len(fields) >= 4:
+            moves.append((int(row), int(col), ms, int(fields[1]), int(fields[2]), int(fields[3])))
+        else:
+            moves.append((int(row), int(col), ms, None, None, None))
+    return game
+
+
+def put_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def varints(data):
+    # Mọi số nguyên varint trong `data` theo thứ tự (một vòng lặp cho cả ván)
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def pack_game(game):
+    payload = bytearray()
+    for row, col, ms, nodes, depth, score in game["moves"]:
+        put_varint(payload, row)
+        put_varint(payload, col)
+        put_varint(payload, ms << 1 | (depth is not None))
+        if depth is not None:
+            put_varint(payload, nodes)
+            put_varint(payload, depth)
+            put_varint(payload, score << 1 if score >= 0 else (-score << 1) - 1) # zigzag: số âm nhỏ vẫn ngắn
+    result = UNFINISHED if game["result"] is None else game["result"]
+    header = GAME_HEADER.pack(game["size"], len(game["moves"]), result, int(game["start"]), len(payload))
+    return header + bytes(payload)
+
+
+def unpack_moves(data):
+    values = varints(data)
+    moves = []
+    i, end = 0, len(values)
+    while i < end:
+        row, col, ms = values[i], values[i + 1], values[i + 2]
+        if ms & 1:
+            score = values[i + 5]
+            score = score >> 1 if not score & 1 else -((score + 1) >> 1)
+            moves.append((row, col, ms >> 1, values[i + 3], values[i + 4], score))
+            i += 6
+        else:
+            moves.append((row, col, ms >> 1, None, None, None))
+            i += 3
+    return moves
+
+
+def is_binary(path):
+    with open(path, "rb") as f:
+        return f.read(len(RECORD_MAGIC)) == RECORD_MAGIC
+
+
+class GameWriter:
+    # Ghi nối tiếp các ván vào tệp lưu trữ (tạo mới nếu chưa có). Định dạng theo tệp đã có, nếu tệp mới thì
+    # nhị phân khi đuôi tệp là .bin. Mỗi ván được đẩy xuống đĩa ngay sau khi ghi.
+    def __init__(self, path, binary=None):
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            binary = is_binary(path)
+        elif binary is None:
+            binary = path.endswith(".bin")
+        self.binary = binary
+        self.file = open(path, "ab")
+        if binary and not exists:
+            self.file.write(RECORD_MAGIC)
+        self.games = 0
+
+    def write(self, game):
+        if self.binary:
+            self.file.write(pack_game(game))
+        else:
+            self.file.write((format_game(game) + "\n").encode("utf-8"))
+        self.file.flush()
+        self.games += 1
+
+    def close(self):
+        self.file.close()
+
+
+class GameReader:
+    # Đọc lần lượt các ván trong tệp lưu trữ mà không nạp cả tệp vào bộ nhớ; offsets() lập chỉ mục
+    # (vị trí byte của từng ván) để đọc lại một ván bất kỳ bằng game_at
+    def __init__(self, path):
+        self.path = path
+        self.binary = is_binary(path)
+
+    def __iter__(self):
+        for _, game in self.scan(decode=True):
+            yield game
+
+    def offsets(self):
+        return [offset for offset, _ in self.scan(decode=False)]
+
+    def scan(self, decode):
+        # Sinh (vị trí, ván hoặc None nếu decode=False)
+        with open(self.path, "rb") as f:
+            if self.binary:
+                f.seek(len(RECORD_MAGIC))
+                while True:
+                    offset = f.tell()
+                    header = f.read(GAME_HEADER.size)
+                    if len(header) < GAME_HEADER.size:
+                        return
+                    length = GAME_HEADER.unpack(header)[4]
+                    if decode:
+                        yield offset, self.decode(header, f.read(length))
+                    else:
+                        f.seek(length, os.SEEK_CUR)
+                        yield offset, None
+            else:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        yield offset, parse_game(line.decode("utf-8")) if decode else None
+                    offset += len(line)
+
+    def decode(self, header, data):
+        size, _, result, start, _ = GAME_HEADER.unpack(header)
+        game = new_game(size, start)
+        game["result"] = None if result == UNFINISHED else result
+        game["moves"] = unpack_moves(data)
+        return game
+
+    def game_at(self, offset):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            if not self.binary:
+                return parse_game(f.readline().decode("utf-8"))
+            header = f.read(GAME_HEADER.size)
+            return self.decode(header, f.read(GAME_HEADER.unpack(header)[4]))
+
+
+class Replayer:
+    # Dựng lại các thế cờ của ván bằng cách đánh dần từng nước trên một bàn cờ (không dựng lại từ đầu mỗi nước).
+    # Bàn cờ của mỗi kích thước được dùng lại giữa các ván: hết ván thì hoàn tác các nước đã đánh.
+    def __init__(self):
+        self.boards = {}
+        self.positions = 0
+
+    def replay(self, game):
+        # Sinh (số thứ tự nước, bàn cờ sau nước đó, nước đi); bàn cờ chỉ đúng cho tới lần sinh kế tiếp
+        size = game["size"]
+        board = self.boards.get(size)
+        if board is None:
+            board = self.boards[size] = new_board(size)
+        played = []
+        try:
+            player = 1
+            for ply, move in enumerate(game["moves"]):
+                board.mark_sqr(move[0], move[1], player)
+                played.append(move)
+                self.positions += 1
+                yield ply, board, move
+                player = 3 - player
+        finally:
+            for move in reversed(played):
+                board.unmake_sqr(move[0], move[1])
+            board.winning_line = None
+
+    def check(self, game):
+        # Kết quả tính lại từ các nước đi (người thắng, 0 nếu chưa ai thắng) và nước đi làm ván kết thúc
+        for ply, board, move in self.replay(game):
+            winner = board.final_state(move[0], move[1])
+            if winner:
+                return winner, ply
+        return 0, None
+
+
+def replay_archive(path):
+    # Dựng lại mọi thế cờ trong tệp lưu trữ và đối chiếu kết quả đã ghi; trả về thống kê
+    replayer = Replayer()
+    start = time.perf_counter()
+    games = mismatches = 0
+    for game in GameReader(path):
+        games += 1
+        winner, ply = replayer.check(game)
+        if game["result"] is None: # Ván chưa xong: không có kết quả để đối chiếu
+            continue
+        if winner != game["result"] or (winner and ply != len(game["moves"]) - 1):
+            mismatches += 1
+    elapsed = time.perf_counter() - start
+    return {"games": games, "positions": replayer.positions, "mismatches": mismatches, "time": elapsed,
+            "positions_per_sec": replayer.positions / elapsed if elapsed else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Đọc, chuyển đổi và dựng lại tệp lưu trữ ván cờ")
+    commands = parser.add_subparsers(dest="command", required=True)
+    index = commands.add_parser("index", help="Đếm các ván và in vị trí byte của từng ván")
+    index.add_argument("archive")
+    show = commands.add_parser("show", help="In một ván theo vị trí byte (xem index)")
+    show.add_argument("archive")
+    show.add_argument("offset", type=int)
+    replay = commands.add_parser("replay", help="Dựng lại mọi thế cờ và kiểm tra kết quả đã ghi")
+    replay.add_argument("archive")
+    convert = commands.add_parser("convert", help="Chuyển giữa định dạng văn bản và nhị phân (.bin)")
+    convert.add_argument("archive")
+    convert.add_argument("output")
+    args = parser.parse_args()
+
+    if args.command == "index":
+        offsets = GameReader(args.archive).offsets()
+        for number, offset in enumerate(offsets):
+            print(number, offset)
+        print(f"{len(offsets)} ván", file=sys.stderr)
+    elif args.command == "show":
+        print(format_game(GameReader(args.archive).game_at(args.offset)))
+    elif args.command == "replay":
+        stats = replay_archive(args.archive)
+        print(f"{stats['games']} ván, {stats['positions']} thế cờ trong {stats['time']:.2f}s "
+              f"({stats['positions_per_sec']:.0f} thế cờ/s), {stats['mismatches']} ván sai kết quả")
+    else:
+        writer = GameWriter(args.output)
+        for game in GameReader(args.archive):
+            writer.write(game)
+        writer.close()
+        print(f"{writer.games} ván -> {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import json
+import time
+
+# Đo đạc quá trình ra quyết định của AI: thời gian từng giai đoạn của eval, thống kê mỗi nước đi
+# và các hook (hàm callback(event, data)) nhận sự kiện "phase", "depth" và "decision".
+# Không có hook nào thì chỉ tốn vài lần đọc đồng hồ mỗi nước đi (không có gì chạy ở từng nút tìm kiếm).
+
+# Các bộ đếm tích lũy của AI; thống kê mỗi nước đi là hiệu giữa sau và trước khi eval
+COUNTERS = ("nodes", "tt_probes", "tt_hits", "cutoffs", "first_move_cutoffs", "threat_nodes",
+            "eval_hits", "eval_misses", "eval_evictions")
+
+
+def counters(ai):
+    return {
+        "nodes": ai.nodes,
+        "tt_probes": ai.transposition_table.probes,
+        "tt_hits": ai.transposition_table.hits,
+        "cutoffs": ai.move_orderer.cutoffs,
+        "first_move_cutoffs": ai.move_orderer.first_move_cutoffs,
+        "threat_nodes": ai.threat_search.total_nodes,
+        "eval_hits": ai.eval_cache.hits if ai.eval_cache else 0,
+        "eval_misses": ai.eval_cache.misses if ai.eval_cache else 0,
+        "eval_evictions": ai.eval_cache.evictions if ai.eval_cache else 0,
+    }
+
+
+class PhaseTimer:
+    # Ghi thời gian các giai đoạn nối tiếp nhau của một lần eval; giai đoạn cuối cùng là nơi ra quyết định
+    def __init__(self, hooks):
+        self.hooks = hooks
+        self.phases = {}
+        self.current = None
+        self.start = time.perf_counter()
+
+    def enter(self, name):
+        self.finish()
+        self.current = name
+
+    def finish(self):
+        now = time.perf_counter()
+        if self.current is not None:
+            elapsed = now - self.start
+            self.phases[self.current] = self.phases.get(self.current, 0.0) + elapsed
+            if self.hooks:
+                emit(self.hooks, "phase", {"phase": self.current, "time": elapsed})
+        self.start = now
+
+
+def emit(hooks, event, data):
+    for hook in hooks:
+        hook(event, data)
+
+
+def decision_stats(ai, board, move, timer, control, before):
+    # Thống kê của một quyết định (dict để dễ ghi JSON); thông tin tìm kiếm chỉ có khi nước đi đến từ tìm kiếm
+    after = counters(ai)
+    stats = {
+        "size": board.size,
+        "player": ai.player,
+        "moves_played": board.marked_sqrs,
+        "move": move,
+        "source": timer.current,
+        "time": control.elapsed(),
+        "phases": timer.phases,
+        "stop_reason": control.reason,
+    }
+    for key in COUNTERS:
+        stats[key] = after[key] - before[key]
+    stats["tt_hit_rate"] = stats["tt_hits"] / stats["tt_probes"] if stats["tt_probes"] else 0.0
+    eval_lookups = stats["eval_hits"] + stats["eval_misses"]
+    stats["eval_hit_rate"] = stats["eval_hits"] / eval_lookups if eval_lookups else 0.0
+    stats["first_move_cutoff_rate"] = stats["first_move_cutoffs"] / stats["cutoffs"] if stats["cutoffs"] else 0.0
+    search = ai.last_search if timer.current in ("search", "ponder") else None
+    stats["depth"] = search["depth"] if search else 0
+    stats["score"] = search["score"] if search else None
+    stats["pv"] = search["pv"] if search else []
+    stats["depths"] = search["depths"] if search else []
+    stats["nps"] = stats["nodes"] / stats["time"] if stats["time"] else 0.0
+    return stats
+
+
+class JsonlTrace:
+    # Hook ghi mọi sự kiện ra tệp JSON lines (mỗi dòng một sự kiện) để phân tích sau
+    def __init__(self, path, events=("phase", "depth", "decision")):
+        self.file = open(path, "a", encoding="utf-8")
+        self.events = events
+
+    def __call__(self, event, data):
+        if event in self.events:
+            self.file.write(json.dumps({"event": event, "ts": time.time(), **data}, ensure_ascii=False) + "\n")
+            if event == "decision":
+                self.file.flush()
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,83 @@
+import time
+
+# Thứ tự ưu tiên: nước đi trong bảng chuyển vị, nước thắng ngay, nước chặn thắng, nước sát thủ (killer)
+TT_MOVE, WIN, BLOCK, KILLER_1, KILLER_2, QUIET = 5, 4, 3, 2, 1, 0
+
+
+class MoveOrderer:
+    # Sắp xếp nước đi cho minimax mà không sao chép hay đánh giá lại toàn bộ bàn cờ:
+    # nước trong bảng chuyển vị -> thắng ngay -> chặn thắng -> killer theo ply -> bảng lịch sử -> điểm tĩnh.
+    def __init__(self):
+        self.killers = {} # ply -> [killer mới nhất, killer trước đó]
+        self.history = [None, {}, {}] # history[player][move]: tổng depth * depth khi nước đi gây cắt tỉa
+        self.nodes = 0 # Số nút đã sắp xếp nước đi
+        self.cutoffs = 0 # Số nút bị cắt tỉa beta
+        self.first_move_cutoffs = 0 # Số lần cắt tỉa ngay ở nước đi đầu tiên
+        self.order_time = 0.0 # Tổng thời gian sắp xếp (giây)
+
+    def new_search(self):
+        # Gọi trước mỗi nước đi của AI: killer chỉ đúng cho cây hiện tại, lịch sử được giảm dần
+        self.killers = {}
+        for player in (1, 2):
+            self.history[player] = {move: score // 2 for move, score in self.history[player].items() if score > 1}
+
+    def clear(self):
+        # Bỏ killer và bảng lịch sử khi chuyển sang một thế cờ không liên quan (phân tích hàng loạt)
+        self.killers = {}
+        self.history = [None, {}, {}]
+
+    def makes_five(self, board, row, col, player):
+        # Nước đi (row, col) có tạo ra max_item_win quân liên tiếp cho `player` không
+        if board.evaluator is not None:
+            return board.evaluator.completes(row, col, player, board.max_item_win - 1)
+        board.mark_sqr(row, col, player)
+        result = board.final_state(row, col) == player
+        board.unmake_sqr(row, col)
+        return result
+
+    def order(self, board, moves, ply, tt_move, player):
+        start = time.perf_counter()
+        self.nodes += 1
+        opponent = 3 - player
+        killers = self.killers.get(ply, ())
+        history = self.history[player]
+        center = board.size // 2
+
+        def key(move):
+            row, col = move
+            if move == tt_move:
+                tier = TT_MOVE
+            elif self.makes_five(board, row, col, player):
+                tier = WIN
+            elif self.makes_five(board, row, col, opponent):
+                tier = BLOCK
+            elif move in killers:
+                tier = KILLER_1 if move == killers[0] else KILLER_2
+            else:
+                tier = QUIET
+            # Điểm tĩnh rẻ: ưu tiên các nước gần trung tâm
+            return tier, history.get(move, 0), -(abs(row - center) + abs(col - center))
+
+        ordered = sorted(moves, key=key, reverse=True)
+        self.order_time += time.perf_counter() - start
+        return ordered
+
+    def cutoff(self, move, ply, depth, player, index):
+        # Ghi nhận nước đi gây cắt tỉa beta (index là vị trí của nước đi trong danh sách đã sắp xếp)
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        killers = self.killers.setdefault(ply, [None, None])
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[player][move] = self.history[player].get(move, 0) + depth * depth
+
+    def stats(self):
+        return {
+            "nodes": self.nodes,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+            "order_time": self.order_time,
+        }
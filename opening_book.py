@@ -0,0 +1,144 @@
+import mmap
+import os
+import struct
+
+from symmetry import to_canonical, from_canonical
+
+
+class OpeningBook:
+    # Sách khai cuộc theo khóa chuẩn (symmetry.canonical): mỗi thế cờ chỉ lưu một lần cho cả 8 hướng
+    # xoay/lật, nước đi lưu theo hướng chuẩn và được đổi về hướng thật khi tra.
+    def __init__(self):
+        self.entries = {} # Khóa chuẩn -> danh sách nước đi theo hướng chuẩn
+        self.probes = 0
+        self.hits = 0
+
+    def add(self, board, moves):
+        key, sym = board.canonical_hash()
+        stored = self.entries.setdefault(key, [])
+        for move in moves:
+            move = to_canonical(move, sym, board.size)
+            if move not in stored:
+                stored.append(move)
+
+    def lookup(self, board):
+        # Các nước đi trong sách cho thế cờ hiện tại (theo hướng thật, chỉ các ô còn trống)
+        self.probes += 1
+        key, sym = board.canonical_hash()
+        moves = [from_canonical(move, sym, board.size) for move in self.entries.get(key, ())]
+        moves = [move for move in moves if board.empty_sqr(*move)]
+        if moves:
+            self.hits += 1
+        return moves
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+        }
+
+    @classmethod
+    def from_lists(cls, lists, board_cls):
+        # Dựng sách từ danh sách nước đi theo kích thước ({(n, n): [nước đi]}): dùng cho bàn trống
+        # và mọi thế cờ có đúng một quân (của bất kỳ bên nào), bỏ các ô đã có quân
+        book = cls()
+        for (size, _), moves in lists.items():
+            book.add(board_cls(size), moves)
+            for row in range(size):
+                for col in range(size):
+                    for player in (1, 2):
+                        board = board_cls(size)
+                        board.mark_sqr(row, col, player)
+                        book.add(board, [move for move in moves if move != (row, col)])
+        return book
+
+
+BOOK_MAGIC = b"CRBK"
+BOOK_VERSION = 1
+BOOK_HEADER = struct.Struct("<4sHHI") # magic, phiên bản, kích thước bản ghi, số bản ghi
+# Bản ghi 16 byte, sắp xếp theo (khóa, kích thước): khóa chuẩn, kích thước bàn cờ, bên đi, hàng, cột (hướng chuẩn), độ sâu, điểm
+BOOK_RECORD = struct.Struct("<QBBBBBxh")
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+BOOK_PLIES = 4 # Sách sinh sẵn gồm các thế cờ có ít hơn số quân này
+
+_binary_books = {}
+
+
+def write_book(path, records):
+    # records: danh sách (khóa chuẩn, kích thước, bên đi, hàng, cột, độ sâu, điểm); nước đi theo hướng chuẩn
+    records = sorted(records)
+    with open(path, "wb") as out:
+        out.write(BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, BOOK_RECORD.size, len(records)))
+        for key, size, player, row, col, depth, score in records:
+            score = max(-32768, min(32767, int(score)))
+            out.write(BOOK_RECORD.pack(key, size, player, row, col, min(depth, 255), score))
+
+
+class BinaryBook:
+    # Sách khai cuộc sinh sẵn (build_book.py), đọc qua mmap và tìm nhị phân theo khóa chuẩn:
+    # mở sách chỉ đọc phần đầu tệp nên thời gian khởi động không tăng theo kích thước sách.
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.count = BOOK_HEADER.unpack_from(self.data, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION or record_size != BOOK_RECORD.size:
+            raise ValueError(f"{path}: không phải sách khai cuộc phiên bản {BOOK_VERSION}")
+        self.probes = 0
+        self.hits = 0
+
+    def record(self, index):
+        return BOOK_RECORD.unpack_from(self.data, BOOK_HEADER.size + index * BOOK_RECORD.size)
+
+    def find(self, key, size):
+        # Tìm nhị phân theo (khóa, kích thước): bàn trống có khóa 0 ở mọi kích thước
+        target = (key, size)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self.record(mid)[:2] < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.count:
+            record = self.record(low)
+            if record[:2] == target:
+                return record
+        return None
+
+    def probe(self, board, player):
+        # (nước đi theo hướng thật, điểm, độ sâu) cho `player` ở thế cờ hiện tại, hoặc None
+        self.probes += 1
+        key, sym = board.canonical_hash()
+        record = self.find(key, board.size)
+        if record is None:
+            return None
+        _, size, to_move, row, col, depth, score = record
+        if to_move != player:
+            return None
+        move = from_canonical((row, col), sym, size)
+        if not board.empty_sqr(*move):
+            return None
+        self.hits += 1
+        return move, score, depth
+
+    def stats(self):
+        return {
+            "entries": self.count,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+        }
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+
+def load_book(path=BOOK_PATH):
+    # Sách dùng chung cho mọi AI trong tiến trình; None nếu chưa sinh tệp sách
+    if path not in _binary_books:
+        _binary_books[path] = BinaryBook(path) if os.path.exists(path) else None
+    return _binary_books[path]
@@ -0,0 +1,160 @@
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# Tìm kiếm song song bằng cách chia các nước đi ở gốc cho nhiều tiến trình (root splitting).
+# Mỗi tiến trình giữ một AI riêng (cùng bảng chuyển vị giữa các nước đi của ván) và tìm sâu dần
+# trên phần nước đi gốc được giao; kết quả được ghép ở độ sâu mà mọi tiến trình đều đã hoàn thành.
+# Giới hạn số nút còn lại được chia đều cho các phần; hủy lượt suy nghĩ (giao diện, luồng suy nghĩ trước)
+# được chuyển tới các tiến trình con qua một multiprocessing.Event dùng chung.
+CANCEL_POLL = 0.01 # Chu kỳ (giây) kiểm tra cờ hủy của lượt suy nghĩ trong lúc chờ các tiến trình con
+
+_worker_ai = None # AI của tiến trình con, giữ lại giữa các lần gọi
+_worker_config = None
+_cancel_event = None # Cờ hủy dùng chung với tiến trình chính (nhận qua initializer của pool)
+
+
+def init_worker(cancel_event):
+    global _cancel_event
+    _cancel_event = cancel_event
+
+
+def ai_config(ai):
+    # Các tùy chọn cần thiết để dựng lại cùng một AI trong tiến trình con
+    return {
+        "player": ai.player,
+        "tt_size_mb": ai.transposition_table.max_mb,
+        "evaluator": ai.evaluator,
+        "vectorized": ai.vectorized,
+        "full_width_size": ai.full_width_size,
+        "symmetry": ai.symmetry,
+        "eval_cache_mb": ai.eval_cache.max_bytes / (1024 * 1024) if ai.eval_cache else 0,
+        "eval_cache_policy": ai.eval_cache.policy if ai.eval_cache else '2way',
+        "search": "pvs",
+    }
+
+
+def board_stones(board):
+    # Ảnh chụp bàn cờ dưới dạng danh sách (hàng, cột, người chơi) để gửi sang tiến trình khác
+    if getattr(board, "sparse", False):
+        return [(r, c, player) for (r, c), player in board.cells.items()]
+    return [(r, c, int(board.squares[r][c]))
+            for r in range(board.size) for c in range(board.size) if board.squares[r][c]]
+
+
+def board_spec(board):
+    # (bàn cờ thưa?, kích thước) để dựng lại cùng loại bàn cờ trong tiến trình con (None = không giới hạn)
+    if getattr(board, "sparse", False):
+        return True, None if board.unbounded else board.size
+    return False, board.size
+
+
+def search_root_moves(spec, stones, config, root_moves, max_depth, max_time, max_nodes=None):
+    # Chạy trong tiến trình con: tìm sâu dần chỉ trên các nước đi gốc `root_moves`
+    # (max_time = None: chỉ giới hạn số nút; max_nodes = None: chỉ giới hạn thời gian)
+    global _worker_ai, _worker_config
+    from caro_engine import Board, AI
+    from search_control import SearchControl
+    if _worker_ai is None or _worker_config != config:
+        _worker_ai, _worker_config = AI(**config), config
+    ai = _worker_ai
+    sparse, size = spec
+    if sparse:
+        from sparse_board import SparseBoard
+        board = SparseBoard(size)
+    else:
+        board = Board(size)
+    for row, col, player in stones:
+        board.mark_sqr(row, col, player)
+    ai.max_time = max_time
+    ai.max_nodes = max_nodes
+    ai.transposition_table.new_search()
+    ai.move_orderer.new_search()
+    ai.prepare_board(board)
+    ai.root_moves = root_moves
+    nodes_start = ai.nodes
+    control = SearchControl(max_time, max_nodes, cancel_event=_cancel_event)
+    result = ai.search(board, max_depth, max_time, control)
+    ai.root_moves = None
+    return {
+        "depths": [(info["depth"], info["score"], info["pv"], info["nodes"], info["time"]) for info in result["depths"]],
+        "nodes": ai.nodes - nodes_start,
+    }
+
+
+def split_root_moves(ai, board, workers):
+    # Sắp xếp nước đi gốc rồi chia xen kẽ để mỗi tiến trình đều nhận được vài nước đi tốt
+    moves = ai.move_orderer.order(board, ai.candidate_moves(board), 0, None, ai.player)
+    return [moves[i::workers] for i in range(workers) if moves[i::workers]]
+
+
+def combine(results):
+    # Chọn nước đi có điểm cao nhất ở độ sâu lớn nhất mà mọi phần đều đã hoàn thành; "depths" gộp từng độ sâu
+    # như AI.search (PV tốt nhất giữa các phần, tổng số nút, thời gian của phần chậm nhất)
+    finished = [r["depths"] for r in results if r["depths"]]
+    if not finished:
+        return None
+    depth = min(len(depths) for depths in finished)
+    per_depth = []
+    for index in range(depth):
+        entry = None
+        for depths in finished:
+            _, score, pv, nodes, elapsed = depths[index]
+            if entry is None:
+                entry = {"depth": index + 1, "score": None, "pv": [], "nodes": 0, "time": 0.0}
+            entry["nodes"] += nodes
+            entry["time"] = max(entry["time"], elapsed)
+            if pv and (entry["score"] is None or score > entry["score"]):
+                entry["score"], entry["pv"] = score, pv
+        per_depth.append(entry)
+    best = per_depth[-1]
+    if not best["pv"]:
+        return None
+    return {"best_move": best["pv"][0], "score": best["score"], "pv": best["pv"], "depth": depth, "depths": per_depth}
+
+
+class ParallelSearch:
+    def __init__(self, workers):
+        self.workers = workers
+        self.pool = None
+        self.cancel_event = None
+
+    def search(self, ai, board, max_depth, max_time, control=None):
+        # `control`: điều khiển của lượt suy nghĩ gọi tới; số nút còn lại được chia cho các phần và
+        # hủy `control` thì các tiến trình con cũng dừng
+        start = time.time()
+        parts = split_root_moves(ai, board, self.workers)
+        if self.pool is None:
+            self.cancel_event = multiprocessing.Event()
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                            initargs=(self.cancel_event,))
+        self.cancel_event.clear()
+        if max_time is not None and math.isinf(max_time):
+            max_time = None # Chế độ chỉ giới hạn số nút
+        max_nodes = None
+        if control is not None and control.max_nodes is not None and parts:
+            max_nodes = max(1, (control.max_nodes - control.nodes) // len(parts))
+        stones, config = board_stones(board), ai_config(ai)
+        futures = [self.pool.submit(search_root_moves, board_spec(board), stones, config, part, max_depth, max_time,
+                                    max_nodes)
+                   for part in parts]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=CANCEL_POLL, return_when=FIRST_COMPLETED)
+            if control is not None and control.is_cancelled():
+                self.cancel_event.set()
+        results = [future.result() for future in futures]
+        best = combine(results) or {"best_move": parts[0][0] if parts else None, "score": None, "pv": [], "depth": 0,
+                                    "depths": []}
+        best["nodes"] = sum(r["nodes"] for r in results)
+        if control is not None:
+            control.nodes += best["nodes"]
+        best["time"] = time.time() - start
+        return best
+
+    def close(self):
+        if self.pool is not None:
+            self.cancel_event.set() # Phần đang chạy dừng sau vài chục nút thay vì tìm hết thời gian
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
@@ -0,0 +1,182 @@
+from collections import defaultdict
+
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)] # Cùng thứ tự hướng với AI.evaluate_sequences
+WIN_SCORE = 10000 # Điểm thắng/thua giống AI.evaluate_board
+
+
+def window_score(player_count, opponent_count, max_win):
+    # Các mức điểm của một cửa sổ max_win ô (dùng chung với bảng cửa sổ của pattern_tables)
+    empty_count = max_win - player_count - opponent_count
+    score = 0
+    if opponent_count == max_win - 1 and empty_count == 1:
+        score -= 2000  # Prioritize blocking opponent's winning move
+    elif player_count == max_win - 1 and empty_count == 1:
+        score += 1000
+    elif opponent_count == max_win - 2 and empty_count == 2:
+        score -= 500
+    elif player_count == max_win - 2 and empty_count == 2:
+        score += 100
+    elif player_count > 0 and opponent_count == 0:
+        score += 10 * player_count
+    elif opponent_count > 0 and player_count == 0:
+        score -= 15 * opponent_count
+    return score
+
+
+class PatternEvaluator:
+    # Giữ số quân của mỗi người chơi trong từng cửa sổ max_win ô (theo 4 hướng) và tổng điểm đang chạy.
+    # Mỗi nước đi/hoàn tác chỉ cập nhật các cửa sổ đi qua ô vừa thay đổi, nên đánh giá lá là O(1).
+    def __init__(self, board):
+        self.init_tables(board)
+        k = self.max_item_win
+
+        # Liệt kê mọi cửa sổ nằm trọn trong bàn cờ và các cửa sổ đi qua từng ô
+        self.cell_windows = [[] for _ in range(self.size * self.size)]
+        window_count = 0
+        for dr, dc in DIRECTIONS:
+            for row in range(self.size):
+                for col in range(self.size):
+                    end_r, end_c = row + (k - 1) * dr, col + (k - 1) * dc
+                    if 0 <= end_r < self.size and 0 <= end_c < self.size:
+                        for i in range(k):
+                            self.cell_windows[(row + i * dr) * self.size + col + i * dc].append(window_count)
+                        window_count += 1
+        self.codes = [0] * window_count
+        self.running = [0, window_count * self.tables[1][0], window_count * self.tables[2][0]]
+        self.full = [0, 0, 0] # Số cửa sổ đã đủ max_win quân của mỗi người chơi
+
+        for row in range(self.size):
+            for col in range(self.size):
+                player = board.squares[row][col]
+                if player:
+                    self.update(row, col, player, 1)
+
+    def init_tables(self, board):
+        self.size = board.size
+        self.max_item_win = k = board.max_item_win
+        # Mã của cửa sổ: (số quân người 1) * (k + 1) + (số quân người 2)
+        self.step = (0, k + 1, 1)
+        self.full_code = (0, k * (k + 1), k)
+        codes = (k + 1) * (k + 1)
+        self.tables = [None, [0] * codes, [0] * codes] # Điểm cửa sổ theo góc nhìn người 1 và người 2
+        for c1 in range(k + 1):
+            for c2 in range(k + 1 - c1):
+                code = c1 * (k + 1) + c2
+                self.tables[1][code] = window_score(c1, c2, k)
+                self.tables[2][code] = window_score(c2, c1, k)
+
+    def update(self, row, col, player, delta):
+        # delta = 1 khi đánh dấu ô, -1 khi hoàn tác
+        t1, t2 = self.tables[1], self.tables[2]
+        full1, full2 = self.full_code[1], self.full_code[2]
+        codes = self.codes
+        change = delta * self.step[player]
+        s1 = s2 = 0
+        for w in self.cell_windows[row * self.size + col]:
+            old = codes[w]
+            new = old + change
+            codes[w] = new
+            s1 += t1[new] - t1[old]
+            s2 += t2[new] - t2[old]
+            if new == full1 or old == full1:
+                self.full[1] += 1 if new == full1 else -1
+            elif new == full2 or old == full2:
+                self.full[2] += 1 if new == full2 else -1
+        self.running[1] += s1
+        self.running[2] += s2
+
+    def completes(self, row, col, player, count):
+        # Có cửa sổ nào đi qua ô trống (row, col) đang chứa đúng `count` quân của `player` và không có quân
+        # đối thủ không (count = max_item_win - 1 nghĩa là đánh vào ô này sẽ thắng)
+        target = count * self.step[player]
+        codes = self.codes
+        for w in self.cell_windows[row * self.size + col]:
+            if codes[w] == target:
+                return True
+        return False
+
+    def score(self, player):
+        # Điểm hiện tại theo góc nhìn `player`: điểm các cửa sổ cộng/trừ điểm thắng
+        score = self.running[player]
+        if self.full[player]:
+            score += WIN_SCORE
+        if self.full[3 - player]:
+            score -= WIN_SCORE
+        return score
+
+
+_cell_windows = {}
+
+
+class CellWindows(dict):
+    # cell_windows cho bàn cờ thưa: danh sách cửa sổ (mã số (ô bắt đầu) * 4 + hướng) đi qua một ô
+    # chỉ được tính khi ô đó được dùng tới lần đầu
+    def __init__(self, size, max_win):
+        super().__init__()
+        self.size = size
+        self.max_win = max_win
+
+    def __missing__(self, index):
+        size, k = self.size, self.max_win
+        row, col = divmod(index, size)
+        windows = []
+        for d, (dr, dc) in enumerate(DIRECTIONS):
+            for i in range(k):
+                start_r, start_c = row - i * dr, col - i * dc
+                end_r, end_c = start_r + (k - 1) * dr, start_c + (k - 1) * dc
+                if 0 <= start_r < size and 0 <= start_c < size and 0 <= end_r < size and 0 <= end_c < size:
+                    windows.append((start_r * size + start_c) * 4 + d)
+        self[index] = windows
+        return windows
+
+    def __deepcopy__(self, memo):
+        return self # Chỉ phụ thuộc kích thước bàn cờ: bản sao bộ đánh giá dùng chung bảng này
+
+
+class SparsePatternEvaluator(PatternEvaluator):
+    # PatternEvaluator cho SparseBoard: chỉ giữ các cửa sổ đã được chạm tới (dict) thay vì liệt kê trước mọi
+    # cửa sổ của bàn cờ, nên bộ nhớ và thời gian khởi tạo theo số quân chứ không theo diện tích.
+    # Cửa sổ trống có điểm window_score(0, 0) = 0 nên điểm đang chạy bắt đầu từ 0.
+    def __init__(self, board):
+        self.init_tables(board)
+        key = (self.size, self.max_item_win)
+        self.cell_windows = _cell_windows.get(key)
+        if self.cell_windows is None:
+            self.cell_windows = _cell_windows[key] = CellWindows(self.size, self.max_item_win)
+        self.codes = defaultdict(int)
+        self.running = [0, 0, 0]
+        self.full = [0, 0, 0]
+        for (row, col), player in board.cells.items():
+            self.update(row, col, player, 1)
+
+
+def evaluator_for(board):
+    # Bộ đánh giá tăng dần phù hợp với kiểu bàn cờ
+    if getattr(board, "sparse", False):
+        return SparsePatternEvaluator(board)
+    return PatternEvaluator(board)
+
+
+def full_score(board, player):
+    # Tính lại từ đầu cùng giá trị với PatternEvaluator.score (dùng để đối chiếu)
+    k = board.max_item_win
+    score = 0
+    won = [False, False, False]
+    for dr, dc in DIRECTIONS:
+        for row in range(board.size):
+            for col in range(board.size):
+                end_r, end_c = row + (k - 1) * dr, col + (k - 1) * dc
+                if 0 <= end_r < board.size and 0 <= end_c < board.size:
+                    window = [board.squares[row + i * dr][col + i * dc] for i in range(k)]
+                    player_count = window.count(player)
+                    opponent_count = window.count(3 - player)
+                    score += window_score(player_count, opponent_count, k)
+                    if player_count == k:
+                        won[player] = True
+                    elif opponent_count == k:
+                        won[3 - player] = True
+    if won[player]:
+        score += WIN_SCORE
+    if won[3 - player]:
+        score -= WIN_SCORE
+    return score
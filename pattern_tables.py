@@ -0,0 +1,139 @@
+from itertools import product
+
+from pattern_eval import window_score
+
+# Bảng tra mẫu quân cờ trên một đoạn thẳng. Mỗi đoạn được mã hóa thành số cơ số 3
+# (mỗi ô: 0 trống, 1/2 quân người chơi; ô đầu tiên là chữ số cao nhất) cùng với độ dài đoạn,
+# rồi tra bảng thay vì cắt danh sách và đếm bằng list.count.
+# Mọi bảng đều lưu sẵn kết quả cho cả hai người chơi: bảng[mã] = (None, kết quả người 1, kết quả người 2).
+
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+POSITION_REACH = 3 # evaluate_position xét các ô cách ô đang xét tối đa 3 bước theo mỗi hướng
+
+# Các lớp mẫu (cờ bit, một đoạn có thể thuộc nhiều lớp)
+WIN = 1 # max_item_win quân liên tiếp
+OPEN_FOUR = 2 # 0XXXX0
+FOUR = 4 # 4 quân trong một cửa sổ 5 ô còn 1 ô trống (liền hoặc có lỗ)
+OPEN_THREE = 8 # 0XXX0 (đúng mẫu của is_open_three)
+SPLIT_THREE = 16 # 0X0XX0 hoặc 0XX0X0
+PATTERN_NAMES = {WIN: "win", OPEN_FOUR: "open four", FOUR: "four", OPEN_THREE: "open three",
+                 SPLIT_THREE: "split three"}
+
+_line_tables = {}
+_position_table = None
+
+
+def pattern_class(text, player, max_win):
+    # Cờ bit các lớp mẫu của `player` trên đoạn `text` (chuỗi chữ số '0'/'1'/'2', chỉ dùng khi dựng bảng)
+    p = str(player)
+    if p not in text:
+        return 0
+    flags = 0
+    if p * max_win in text:
+        flags |= WIN
+    if "0" + p * 4 + "0" in text:
+        flags |= OPEN_FOUR
+    if any(p * gap + "0" + p * (4 - gap) in text for gap in range(5)):
+        flags |= FOUR
+    if "0" + p * 3 + "0" in text:
+        flags |= OPEN_THREE
+    if "0" + p + "0" + p * 2 + "0" in text or "0" + p * 2 + "0" + p + "0" in text:
+        flags |= SPLIT_THREE
+    return flags
+
+
+def potential_points(player_count, empty_count, max_win):
+    # Mức điểm tiềm năng của một đoạn: 50 nếu còn thiếu 2 quân với 2 ô trống, 10 nếu thiếu 3 quân với 3 ô trống
+    if player_count == max_win - 2 and empty_count == 2:
+        return 50
+    if player_count == max_win - 3 and empty_count == 3:
+        return 10
+    return 0
+
+
+class LineTables:
+    # Bảng cho một điều kiện thắng max_win: đoạn line_code dài tới 2 * max_win - 1 ô và cửa sổ max_win ô
+    def __init__(self, max_win):
+        self.max_win = max_win
+        self.classes = [] # classes[độ dài][mã] -> cờ lớp mẫu của từng người chơi
+        self.potential = [] # potential[độ dài][mã] -> điểm tiềm năng của từng người chơi
+        for length in range(2 * max_win):
+            classes, potential = [], []
+            for line in product("012", repeat=length):
+                text = "".join(line)
+                empty = text.count("0")
+                classes.append((None, pattern_class(text, 1, max_win), pattern_class(text, 2, max_win)))
+                potential.append((None, potential_points(text.count("1"), empty, max_win),
+                                  potential_points(text.count("2"), empty, max_win)))
+            self.classes.append(classes)
+            self.potential.append(potential)
+        self.windows = [] # windows[mã] -> window_score của cửa sổ max_win ô theo góc nhìn từng người chơi
+        for window in product((0, 1, 2), repeat=max_win):
+            ones, twos = window.count(1), window.count(2)
+            self.windows.append((None, window_score(ones, twos, max_win), window_score(twos, ones, max_win)))
+
+
+def line_tables(max_win):
+    tables = _line_tables.get(max_win)
+    if tables is None:
+        tables = _line_tables[max_win] = LineTables(max_win)
+    return tables
+
+
+def position_table():
+    # Đoạn 7 ô quanh một quân (ô ngoài bàn cờ mã hóa như quân đối thủ) -> count ** 2 của evaluate_position:
+    # đếm quân của người chơi từ đầu đoạn cho tới ô chặn đầu tiên (quân đối thủ hoặc mép bàn cờ)
+    global _position_table
+    if _position_table is None:
+        table = []
+        for cells in product((0, 1, 2), repeat=2 * POSITION_REACH + 1):
+            scores = [None]
+            for player in (1, 2):
+                count = 0
+                for cell in cells:
+                    if cell == player:
+                        count += 1
+                    elif cell != 0:
+                        break
+                scores.append(count ** 2)
+            table.append(tuple(scores))
+        _position_table = table
+    return _position_table
+
+
+def line_code(squares, size, row, col, dr, dc, max_win):
+    # Mã của đoạn thẳng qua (row, col): từ i = -max_win + 1 tới max_win - 1, dừng ở ô đầu tiên ngoài bàn cờ
+    code = length = 0
+    for i in range(1 - max_win, max_win):
+        r, c = row + i * dr, col + i * dc
+        if 0 <= r < size and 0 <= c < size:
+            code = code * 3 + squares[r][c]
+            length += 1
+        else:
+            break
+    return length, code
+
+
+def window_code(squares, size, row, col, dr, dc, max_win):
+    # Mã cửa sổ max_win ô bắt đầu tại (row, col), hoặc -1 nếu cửa sổ ra ngoài bàn cờ
+    end_r, end_c = row + (max_win - 1) * dr, col + (max_win - 1) * dc
+    if not (0 <= end_r < size and 0 <= end_c < size):
+        return -1
+    code = 0
+    for i in range(max_win):
+        code = code * 3 + squares[row + i * dr][col + i * dc]
+    return code
+
+
+def position_score(squares, size, row, col, player):
+    # Tương đương AI.evaluate_position: tổng count ** 2 theo 4 hướng, tra bảng đoạn 7 ô
+    table = position_table()
+    blocked = 3 - player
+    score = 0
+    for dr, dc in DIRECTIONS:
+        code = 0
+        for delta in range(-POSITION_REACH, POSITION_REACH + 1):
+            r, c = row + delta * dr, col + delta * dc
+            code = code * 3 + (squares[r][c] if 0 <= r < size and 0 <= c < size else blocked)
+        score += table[code][player]
+    return score
@@ -0,0 +1,82 @@
+import copy
+import threading
+
+from search_control import SearchControl
+
+
+class Ponderer:
+    # Suy nghĩ trong thời gian của người chơi: sau khi AI đi, một luồng nền tìm trước nước đáp trả
+    # cho nước đi mà đối thủ có khả năng chọn nhất (theo PV) và vài phương án khác.
+    # Kết quả được lưu theo khóa Zobrist của thế cờ; bảng chuyển vị của AI cũng được làm nóng.
+    def __init__(self, ai, alternatives=3):
+        self.ai = ai
+        self.alternatives = alternatives # Số nước đi khác ngoài nước dự đoán được tìm trước
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.results = {} # Khóa Zobrist của thế cờ sau nước đối thủ -> nước đi của AI
+        self.hits = 0
+        self.misses = 0
+
+    def expected_replies(self, board):
+        ai = self.ai
+        replies = []
+        pv = (ai.last_search or {}).get("pv") or []
+        # PV của lần tìm kiếm trước chỉ dùng được nếu AI vừa đi đúng nước đầu tiên của PV
+        if len(pv) >= 2 and board.squares[pv[0][0]][pv[0][1]] == ai.player and board.empty_sqr(*pv[1]):
+            replies.append(tuple(pv[1]))
+        ordered = ai.move_orderer.order(board, ai.candidate_moves(board), 1, None, ai.opponent)
+        for move in ordered:
+            if len(replies) > self.alternatives:
+                break
+            if move not in replies:
+                replies.append(move)
+        return replies
+
+    def start(self, board):
+        # Gọi ngay sau khi AI đi xong, trên bàn cờ hiện tại (luồng nền dùng bản sao)
+        self.stop()
+        self.results = {}
+        if board.is_full():
+            return
+        replies = self.expected_replies(board)
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, args=(copy.deepcopy(board), replies), daemon=True)
+        self.thread.start()
+
+    def run(self, board, replies):
+        ai = self.ai
+        for row, col in replies:
+            if self.stop_event.is_set():
+                break
+            board.mark_sqr(row, col, ai.opponent)
+            if board.final_state(row, col) == 0 and not board.is_full():
+                # Mỗi phương án có giới hạn thời gian riêng; stop_event hủy mọi lượt tìm của luồng này
+                control = SearchControl(ai.max_time, ai.max_nodes, cancel_event=self.stop_event)
+                move = ai.eval(board, use_ponder=False, control=control)
+                if not self.stop_event.is_set():
+                    self.results[board.hash] = (move, ai.last_search)
+            board.unmake_sqr(row, col)
+
+    def stop(self):
+        # Hủy việc đang tìm và chờ luồng nền dừng hẳn (tìm kiếm kiểm tra stop_event sau mỗi vài chục nút)
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+
+    def take(self, board):
+        # Lấy nước đi đã tìm trước cho đúng thế cờ hiện tại (nếu có)
+        if not self.results:
+            return None
+        move, search = self.results.pop(board.hash, (None, None))
+        self.results = {}
+        if move is not None and board.empty_sqr(*move):
+            self.hits += 1
+            self.ai.last_search = search
+            return move
+        self.misses += 1
+        return None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
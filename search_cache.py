@@ -0,0 +1,111 @@
+import sqlite3
+import threading
+import time
+
+from symmetry import to_canonical, from_canonical
+
+# Bộ nhớ đệm kết quả tìm kiếm lưu trên đĩa (SQLite), giữ lại giữa các ván và các lần chạy chương trình.
+# Khóa là khóa chuẩn của thế cờ (Board.canonical_hash) cùng kích thước bàn cờ và bên đang đi; mỗi mục lưu
+# nước đi tốt nhất (theo hướng chuẩn), điểm và độ sâu của lần tìm sâu nhất. Nhiều tiến trình có thể dùng chung
+# một tệp: SQLite ở chế độ WAL cho phép đọc song song, ghi được xếp hàng qua busy timeout.
+# Khi vượt quá max_entries, các mục lâu không được dùng nhất bị xóa.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    player INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    score REAL NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (key, size, player)
+);
+CREATE INDEX IF NOT EXISTS entries_used ON entries (used);
+"""
+EVICT_CHECK_EVERY = 64 # Kiểm tra số mục sau mỗi chừng này lần ghi
+EVICT_SLACK = 0.1 # Xóa thêm 10% dưới giới hạn để không phải xóa sau mỗi lần ghi
+
+
+def signed(key):
+    # SQLite chỉ lưu số nguyên có dấu 64 bit
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+class SearchCache:
+    def __init__(self, path, max_entries=100000, timeout=5.0):
+        start = time.perf_counter()
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock() # AI có thể dùng bộ nhớ đệm từ luồng nền và luồng suy nghĩ trước
+        self.db = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.loaded_entries = self.count()
+        self.load_time = time.perf_counter() - start
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def lookup(self, board, player):
+        # (nước đi theo hướng thật, điểm, độ sâu) cho `player` ở thế cờ hiện tại, hoặc None
+        key, sym = board.canonical_hash()
+        with self.lock:
+            self.probes += 1
+            row = self.db.execute("SELECT row, col, score, depth FROM entries WHERE key = ? AND size = ? AND player = ?",
+                                  (signed(key), board.size, player)).fetchone()
+            if row is None:
+                return None
+            move = from_canonical((row[0], row[1]), sym, board.size)
+            if not board.empty_sqr(*move):
+                return None
+            self.hits += 1
+            self.db.execute("UPDATE entries SET used = ? WHERE key = ? AND size = ? AND player = ?",
+                            (time.time(), signed(key), board.size, player))
+        return move, row[2], row[3]
+
+    def store(self, board, player, move, score, depth):
+        # Chỉ ghi đè mục cũ khi kết quả mới sâu hơn hoặc bằng
+        key, sym = board.canonical_hash()
+        row, col = to_canonical(move, sym, board.size)
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key, size, player) DO UPDATE SET row = excluded.row, col = excluded.col, "
+                "depth = excluded.depth, score = excluded.score, used = excluded.used "
+                "WHERE excluded.depth >= entries.depth",
+                (signed(key), board.size, player, row, col, depth, score, time.time()))
+            self.stores += 1
+            if self.stores % EVICT_CHECK_EVERY == 0:
+                self.evict()
+
+    def evict(self):
+        overflow = self.count() - self.max_entries
+        if overflow > 0:
+            overflow += int(self.max_entries * EVICT_SLACK)
+            cursor = self.db.execute("DELETE FROM entries WHERE rowid IN "
+                                     "(SELECT rowid FROM entries ORDER BY used LIMIT ?)", (overflow,))
+            self.evictions += cursor.rowcount
+
+    def stats(self):
+        with self.lock:
+            entries = self.count()
+        return {
+            "entries": entries,
+            "loaded_entries": self.loaded_entries,
+            "load_time": self.load_time,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.probes if self.probes else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,59 @@
+import time
+
+CHECK_EVERY = 64 # Số nút giữa hai lần kiểm tra đồng hồ / cờ hủy
+
+
+class SearchControl:
+    # Điều khiển một lượt suy nghĩ của AI: hạn chót (tính từ lúc eval bắt đầu), giới hạn số nút và cờ hủy.
+    # Tìm kiếm gọi tick() ở mỗi nút; đồng hồ và cờ hủy chỉ được kiểm tra sau mỗi `check_every` nút
+    # nên chi phí gần như bằng 0, còn độ trễ khi bị hủy chỉ vài mili giây.
+    def __init__(self, max_time=None, max_nodes=None, check_every=CHECK_EVERY, cancel_event=None):
+        self.start_time = time.time()
+        self.deadline = self.start_time + max_time if max_time is not None else None
+        self.max_nodes = max_nodes
+        self.check_every = check_every
+        # Sự kiện dùng chung (threading.Event) để hủy nhiều lượt tìm cùng lúc, ví dụ các lượt suy nghĩ trước
+        self.cancel_event = cancel_event
+        self.cancelled = False
+        self.stopped = False # Đã chạm một giới hạn: mọi nút sau đó trả về ngay
+        self.reason = None # 'cancelled', 'time' hoặc 'nodes'
+        self.nodes = 0
+
+    def cancel(self):
+        # Có thể gọi từ luồng khác (giao diện, luồng suy nghĩ trước)
+        self.cancelled = True
+
+    def is_cancelled(self):
+        return self.cancelled or (self.cancel_event is not None and self.cancel_event.is_set())
+
+    def check(self):
+        # Kiểm tra ngay mọi giới hạn (dùng giữa các độ sâu / các bước của eval)
+        if self.stopped:
+            return True
+        if self.is_cancelled():
+            self.reason = 'cancelled'
+        elif self.deadline is not None and time.time() >= self.deadline:
+            self.reason = 'time'
+        elif self.max_nodes is not None and self.nodes >= self.max_nodes:
+            self.reason = 'nodes'
+        else:
+            return False
+        self.stopped = True
+        return True
+
+    def tick(self):
+        # Gọi ở mỗi nút tìm kiếm; trả về True nếu phải dừng
+        self.nodes += 1
+        if self.stopped:
+            return True
+        if self.nodes % self.check_every:
+            return False
+        return self.check()
+
+    def elapsed(self):
+        return time.time() - self.start_time
+
+    def remaining(self):
+        if self.deadline is None:
+            return float('inf')
+        return max(0.0, self.deadline - time.time())
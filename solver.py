@@ -0,0 +1,220 @@
+import os
+
+from symmetry import transform, symmetric_zobrist, canonical
+
+# Giải chính xác bàn 5x5 (3 quân liên tiếp thắng) bằng negamax cắt tỉa alpha-beta trên bitmask.
+# Thế cờ là hai số nguyên 25 bit (quân bên đang đi, quân đối thủ); bit r * 5 + c ứng với ô (r, c).
+# Giá trị tính theo bên đang đi: WIN - d nếu thắng sau d nước (tính cả nước của bên đang đi),
+# -(WIN - d) nếu thua sau d nước, 0 nếu hòa. Bảng ghi nhớ dùng khóa chuẩn theo 8 phép đối xứng.
+SIZE = 5
+CELLS = SIZE * SIZE
+FULL = (1 << CELLS) - 1
+WIN = 100
+INF = 1000
+EXACT, LOWER, UPPER = 0, 1, 2
+# Bảng tra dựng bởi build_tablebase.py (cùng định dạng với sách khai cuộc), gồm các thế cờ có ít hơn
+# TABLEBASE_PLIES quân; các thế cờ sau đó được giải trực tiếp (chỉ mất vài mili giây)
+TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase_5x5.bin")
+TABLEBASE_PLIES = 5
+SOLVE_NODES = 200000 # Giới hạn số nút khi giải trực tiếp trong AI
+
+
+def _lines():
+    lines = []
+    for row in range(SIZE):
+        for col in range(SIZE):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                cells = [(row + i * dr, col + i * dc) for i in range(3)]
+                if all(0 <= r < SIZE and 0 <= c < SIZE for r, c in cells):
+                    lines.append(sum(1 << (r * SIZE + c) for r, c in cells))
+    return lines
+
+
+LINES = _lines()
+# Thứ tự xét ô: gần tâm trước
+ORDER = sorted(range(CELLS), key=lambda cell: abs(cell // SIZE - 2) + abs(cell % SIZE - 2))
+
+
+def _symmetry_tables():
+    # tables[sym][đoạn][5 bit] -> bitmask ảnh của 5 bit thuộc hàng `đoạn` qua phép đối xứng sym
+    tables = []
+    for sym in range(8):
+        chunks = []
+        for chunk in range(SIZE):
+            images = []
+            for bits in range(1 << SIZE):
+                image = 0
+                for col in range(SIZE):
+                    if bits >> col & 1:
+                        r, c = transform(chunk, col, sym, SIZE)
+                        image |= 1 << (r * SIZE + c)
+                images.append(image)
+            chunks.append(images)
+        tables.append(chunks)
+    return tables
+
+
+SYMMETRY_TABLES = _symmetry_tables()
+
+
+def mirror(bits, sym):
+    chunks = SYMMETRY_TABLES[sym]
+    return (chunks[0][bits & 31] | chunks[1][bits >> 5 & 31] | chunks[2][bits >> 10 & 31]
+            | chunks[3][bits >> 15 & 31] | chunks[4][bits >> 20])
+
+
+def canonical_pair(me, opp):
+    best = (me, opp)
+    for sym in range(1, 8):
+        pair = (mirror(me, sym), mirror(opp, sym))
+        if pair < best:
+            best = pair
+    return best
+
+
+def winning_cells(stones, empty):
+    # Các ô trống mà `stones` đánh vào sẽ tạo 3 quân liên tiếp
+    cells = 0
+    for line in LINES:
+        rest = line & ~stones
+        if rest & (rest - 1) == 0 and rest & empty:
+            cells |= rest
+    return cells
+
+
+def has_line(stones):
+    for line in LINES:
+        if stones & line == line:
+            return True
+    return False
+
+
+def parent_value(value):
+    # Giá trị của nước đi dẫn tới thế cờ con có giá trị `value` (theo góc nhìn bên vừa đi)
+    if value > 0:
+        return -value + 1
+    if value < 0:
+        return -value - 1
+    return 0
+
+
+def child_bound(bound):
+    # Ngược lại parent_value: cận của thế cờ con ứng với cận `bound` của thế cờ cha
+    if bound >= INF:
+        return -INF
+    if bound <= -INF:
+        return INF
+    if bound > 0:
+        return -bound - 1
+    if bound < 0:
+        return -bound + 1
+    return 0
+
+
+class Solver:
+    def __init__(self, max_nodes=None):
+        self.memo = {} # Khóa chuẩn -> (giá trị, loại cận)
+        self.nodes = 0
+        self.max_nodes = max_nodes # Vượt quá số nút này thì dừng (solve trả về None)
+        self.aborted = False
+
+    def solve(self, me, opp):
+        # (giá trị, nước đi tốt nhất dạng chỉ số ô) cho bên sở hữu `me` đang đi, hoặc None nếu hết số nút
+        self.aborted = False
+        empty = FULL & ~(me | opp)
+        if not empty or has_line(me) or has_line(opp):
+            return None
+        wins = winning_cells(me, empty)
+        if wins:
+            # Thắng ngay (negamax chỉ kiểm tra ô thắng của bên đang đi, không kiểm tra thế cờ đã kết thúc)
+            return WIN - 1, next(cell for cell in ORDER if wins >> cell & 1)
+        best_value, best_move = -INF, None
+        for cell in self.moves(me, opp, empty):
+            bit = 1 << cell
+            value = parent_value(self.negamax(opp, me | bit, -INF, child_bound(best_value)))
+            if self.aborted:
+                return None
+            if value > best_value:
+                best_value, best_move = value, cell
+        return best_value, best_move
+
+    def moves(self, me, opp, empty):
+        # Thắng ngay nếu được; nếu đối thủ có ô thắng thì chỉ còn nước chặn
+        wins = winning_cells(me, empty)
+        if wins:
+            return [cell for cell in ORDER if wins >> cell & 1][:1]
+        threats = winning_cells(opp, empty)
+        if threats:
+            return [cell for cell in ORDER if threats >> cell & 1]
+        return [cell for cell in ORDER if empty >> cell & 1]
+
+    def negamax(self, me, opp, alpha, beta):
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.aborted = True
+            return 0
+        empty = FULL & ~(me | opp)
+        if winning_cells(me, empty):
+            return WIN - 1
+        if not empty:
+            return 0
+        threats = winning_cells(opp, empty)
+        if threats & (threats - 1):
+            return -(WIN - 2) # Đối thủ có hai ô thắng: chặn một ô thì thua ở ô còn lại
+        key = canonical_pair(me, opp)
+        entry = self.memo.get(key)
+        if entry is not None:
+            value, flag = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER and value >= beta:
+                return value
+            if flag == UPPER and value <= alpha:
+                return value
+        original_alpha = alpha
+        best = -INF
+        for cell in self.moves(me, opp, empty):
+            bit = 1 << cell
+            value = parent_value(self.negamax(opp, me | bit, child_bound(beta), child_bound(alpha)))
+            if self.aborted:
+                return 0
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.memo[key] = (best, flag)
+        return best
+
+
+def position_key(p1, p2):
+    # Khóa chuẩn (giống Board.canonical_hash) của thế cờ cho bởi bitmask quân 1 và quân 2
+    keys = symmetric_zobrist(SIZE)
+    hashes = [0] * 8
+    for player, stones in ((1, p1), (2, p2)):
+        for cell in range(CELLS):
+            if stones >> cell & 1:
+                images = keys[cell][player]
+                for sym in range(8):
+                    hashes[sym] ^= images[sym]
+    return canonical(hashes)
+
+
+def board_bits(squares, player):
+    # (quân của player, quân đối thủ) dạng bitmask từ bàn cờ 5x5 dạng danh sách
+    me = opp = 0
+    for row in range(SIZE):
+        for col in range(SIZE):
+            cell = squares[row][col]
+            if cell == player:
+                me |= 1 << (row * SIZE + col)
+            elif cell:
+                opp |= 1 << (row * SIZE + col)
+    return me, opp
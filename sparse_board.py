@@ -0,0 +1,257 @@
+import random
+
+from transposition import zobrist_keys, ZOBRIST_SEED
+from symmetry import symmetric_zobrist, canonical, transform, SYMMETRIES
+
+# Bàn cờ thưa: chỉ lưu các ô đã có quân (dict (hàng, cột) -> người chơi) cùng khung bao quanh các quân,
+# cùng giao diện với Board. Kiểm tra thắng, tập ứng viên và đánh giá (SparsePatternEvaluator) đều tỉ lệ với
+# số quân chứ không với diện tích, nên dùng được cho bàn 15x15, 19x19 và bàn cờ không giới hạn.
+# Bàn không giới hạn là một bàn vuông ảo cạnh UNBOUNDED_SIZE (người chơi bắt đầu ở giữa, không bao giờ chạm mép);
+# khóa Zobrist của nó được sinh dần theo từng ô thay vì lập bảng cho mọi ô.
+UNBOUNDED_SIZE = 1 << 16
+TABLE_LIMIT = 32 # Bàn có cạnh tới mức này dùng chung bảng khóa Zobrist với Board (sách khai cuộc, bảng tra)
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1)] # Cùng thứ tự hướng với Board.final_state
+
+_lazy_keys = {}
+_neighbors = {}
+
+
+class LazyZobrist(dict):
+    # keys[r * size + c][player] giống zobrist_keys nhưng chỉ sinh khóa cho các ô được dùng tới
+    def __init__(self, size):
+        super().__init__()
+        self.size = size
+
+    def __missing__(self, index):
+        rng = random.Random(ZOBRIST_SEED * 1000003 + self.size * 7919 + index)
+        keys = self[index] = (0, rng.getrandbits(64), rng.getrandbits(64))
+        return keys
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class LazySymmetricZobrist(dict):
+    # keys[r * size + c][player] = tuple 8 khóa qua từng phép đối xứng, như symmetry.symmetric_zobrist
+    def __init__(self, base):
+        super().__init__()
+        self.base = base
+
+    def __missing__(self, index):
+        size = self.base.size
+        row, col = divmod(index, size)
+        images = [transform(row, col, sym, size) for sym in range(SYMMETRIES)]
+        keys = self[index] = (None,) + tuple(tuple(self.base[r * size + c][player] for r, c in images)
+                                             for player in (1, 2))
+        return keys
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def lazy_keys(size):
+    keys = _lazy_keys.get(size)
+    if keys is None:
+        base = LazyZobrist(size)
+        keys = _lazy_keys[size] = (base, LazySymmetricZobrist(base))
+    return keys
+
+
+class SparseSquares:
+    # Cho phép đọc board.squares[r][c] (0 nếu ô trống) như với mảng NumPy / danh sách lồng nhau
+    def __init__(self, cells):
+        self.cells = cells
+
+    def __getitem__(self, row):
+        return SparseRow(self.cells, row)
+
+
+class SparseRow:
+    __slots__ = ("cells", "row")
+
+    def __init__(self, cells, row):
+        self.cells = cells
+        self.row = row
+
+    def __getitem__(self, col):
+        return self.cells.get((self.row, col), 0)
+
+
+class LazyNeighbors(dict):
+    # neighbors[(r, c)]: các ô trong bán kính `radius` quanh (r, c) như candidates.neighbor_table,
+    # chỉ tính cho các ô được dùng tới; dùng chung giữa các bàn cờ cùng kích thước
+    def __init__(self, size, radius):
+        super().__init__()
+        self.size = size
+        self.radius = radius
+
+    def __missing__(self, cell):
+        row, col = cell
+        radius, size = self.radius, self.size
+        cells = self[cell] = tuple((r, c)
+                                   for r in range(max(0, row - radius), min(size, row + radius + 1))
+                                   for c in range(max(0, col - radius), min(size, col + radius + 1))
+                                   if (r, c) != (row, col))
+        return cells
+
+    def __deepcopy__(self, memo):
+        return self # Bảng chỉ được thêm, không đổi: bản sao bàn cờ dùng chung
+
+
+class SparseCandidateSet:
+    # Như CandidateSet nhưng đếm số quân lân cận trong dict, không cấp phát mảng theo diện tích bàn cờ
+    def __init__(self, size, radius=2):
+        self.size = size
+        self.radius = radius
+        self.near = {}
+        self.cells = set()
+        self.neighbors = _neighbors.get((size, radius))
+        if self.neighbors is None:
+            self.neighbors = _neighbors[(size, radius)] = LazyNeighbors(size, radius)
+
+    def mark(self, row, col, empty_sqr):
+        self.cells.discard((row, col))
+        near = self.near
+        for cell in self.neighbors[(row, col)]:
+            near[cell] = near.get(cell, 0) + 1
+            if empty_sqr(*cell):
+                self.cells.add(cell)
+
+    def unmark(self, row, col):
+        near = self.near
+        for cell in self.neighbors[(row, col)]:
+            count = near[cell] - 1
+            if count:
+                near[cell] = count
+            else:
+                del near[cell]
+                self.cells.discard(cell)
+        if (row, col) in near:
+            self.cells.add((row, col))
+
+    def sorted(self):
+        return sorted(self.cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+
+class SparseBoard:
+    sparse = True
+
+    def __init__(self, size=None, candidate_radius=2):
+        self.unbounded = size is None # Bàn cờ không giới hạn
+        self.size = UNBOUNDED_SIZE if size is None else size
+        self.cells = {} # (hàng, cột) -> người chơi, chỉ các ô đã có quân
+        self.squares = SparseSquares(self.cells)
+        self.marked_sqrs = 0
+        self.max_item_win = 3 if size == 5 else 5 # Điều kiện thắng giống Board
+        self.winning_line = None
+        if self.size <= TABLE_LIMIT:
+            self.zobrist = zobrist_keys(self.size) # Cùng khóa với Board: dùng chung sách khai cuộc / bộ nhớ đệm
+            self.sym_zobrist = symmetric_zobrist(self.size)
+        else:
+            self.zobrist, self.sym_zobrist = lazy_keys(self.size)
+        self.hash = 0
+        self.sym_hashes = [0] * 8
+        self.evaluator = None
+        self.candidates = SparseCandidateSet(self.size, candidate_radius)
+        self.radius = candidate_radius
+        self.bounds = [] # Ngăn xếp khung bao (hàng nhỏ nhất, hàng lớn nhất, cột nhỏ nhất, cột lớn nhất) sau mỗi nước
+
+    def bounding_box(self):
+        # (hàng nhỏ nhất, hàng lớn nhất, cột nhỏ nhất, cột lớn nhất) của các quân, None nếu bàn trống
+        return self.bounds[-1] if self.bounds else None
+
+    def final_state(self, marked_row, marked_col):
+        cells, k = self.cells, self.max_item_win
+        player = cells.get((marked_row, marked_col), 0)
+        if not player:
+            return 0
+        for dr, dc in DIRECTIONS:
+            # Đếm quân liên tiếp về hai phía của ô vừa đánh
+            back = 0
+            while back < k - 1 and cells.get((marked_row - (back + 1) * dr, marked_col - (back + 1) * dc)) == player:
+                back += 1
+            forward = 0
+            while forward < k - 1 and cells.get((marked_row + (forward + 1) * dr, marked_col + (forward + 1) * dc)) == player:
+                forward += 1
+            if back + forward + 1 >= k:
+                # Cùng đường thắng với Board.final_state: max_item_win ô đầu tiên tính từ phía trước
+                start = (marked_row - back * dr, marked_col - back * dc)
+                end = (start[0] + (k - 1) * dr, start[1] + (k - 1) * dc)
+                self.winning_line = (start, end)
+                return player
+        return 0
+
+    def mark_sqr(self, row, col, player):
+        self.cells[(row, col)] = player
+        self.marked_sqrs += 1
+        index = row * self.size + col
+        self.hash ^= self.zobrist[index][player]
+        keys = self.sym_zobrist[index][player]
+        self.sym_hashes = [h ^ k for h, k in zip(self.sym_hashes, keys)]
+        box = self.bounds[-1] if self.bounds else (row, row, col, col)
+        self.bounds.append((min(box[0], row), max(box[1], row), min(box[2], col), max(box[3], col)))
+        if self.evaluator is not None:
+            self.evaluator.update(row, col, player, 1)
+        self.candidates.mark(row, col, self.empty_sqr)
+
+    def unmake_sqr(self, row, col):
+        player = self.cells.pop((row, col))
+        index = row * self.size + col
+        self.hash ^= self.zobrist[index][player]
+        keys = self.sym_zobrist[index][player]
+        self.sym_hashes = [h ^ k for h, k in zip(self.sym_hashes, keys)]
+        if self.evaluator is not None:
+            self.evaluator.update(row, col, player, -1)
+        self.marked_sqrs -= 1
+        self.bounds.pop() # Các nước được hoàn tác theo thứ tự ngược lại
+        self.candidates.unmark(row, col)
+        self.winning_line = None
+
+    def canonical_hash(self):
+        return canonical(self.sym_hashes)
+
+    def grid(self):
+        # Các hàm tra bảng mẫu chỉ đọc grid()[r][c] trong phạm vi bàn cờ
+        return self.squares
+
+    def empty_sqr(self, row, col):
+        return (row, col) not in self.cells
+
+    def get_empty_sqrs(self):
+        # Các ô trống trong khung bao quanh các quân (mở rộng thêm bán kính ứng viên); bàn trống: vùng quanh tâm.
+        # Bàn nhỏ (không lớn hơn khung) cho cùng kết quả với Board.get_empty_sqrs.
+        box = self.bounding_box()
+        if box is None:
+            center = self.size // 2
+            box = (center, center, center, center)
+        top, bottom = max(0, box[0] - self.radius), min(self.size - 1, box[1] + self.radius)
+        left, right = max(0, box[2] - self.radius), min(self.size - 1, box[3] + self.radius)
+        return [(r, c) for r in range(top, bottom + 1) for c in range(left, right + 1) if (r, c) not in self.cells]
+
+    def is_full(self):
+        return self.marked_sqrs == self.size * self.size
+
+    def has_win(self, player):
+        for (row, col), owner in list(self.cells.items()):
+            if owner == player and self.final_state(row, col) == player:
+                return True
+        return False
+
+    def longest_sequence(self, player):
+        longest = 0
+        cells = self.cells
+        for (row, col), owner in cells.items():
+            if owner != player:
+                continue
+            for dr, dc in DIRECTIONS:
+                # Chỉ đếm từ quân đầu dãy để mỗi dãy được đếm một lần; Board đếm trong đoạn 2 * max_item_win - 1 ô
+                if cells.get((row - dr, col - dc)) == player:
+                    continue
+                count = 1
+                while count < 2 * self.max_item_win - 1 and cells.get((row + count * dr, col + count * dc)) == player:
+                    count += 1
+                longest = max(longest, count)
+        return longest
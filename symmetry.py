@@ -0,0 +1,72 @@
+from transposition import zobrist_keys
+
+# 8 phép đối xứng của bàn cờ vuông (nhóm nhị diện D4): 4 phép quay và 4 phép lật.
+# Mỗi bàn cờ giữ 8 khóa Zobrist, khóa thứ s là khóa Zobrist của thế cờ sau phép đối xứng s; cả 8 khóa
+# được cập nhật dần trong mark_sqr/unmake_sqr. Khóa chuẩn (canonical) là khóa nhỏ nhất trong 8 khóa,
+# nên mọi thế cờ xoay/lật của nhau có cùng khóa chuẩn. Nước đi được lưu theo hướng chuẩn và đổi
+# ngược lại hướng thật khi đọc.
+SYMMETRIES = 8
+
+_symmetric_zobrist_cache = {}
+
+
+def transform(row, col, sym, size):
+    # Ảnh của ô (row, col) qua phép đối xứng `sym`
+    n = size - 1
+    if sym == 0:
+        return row, col
+    if sym == 1:
+        return col, n - row # Quay 90 độ
+    if sym == 2:
+        return n - row, n - col # Quay 180 độ
+    if sym == 3:
+        return n - col, row # Quay 270 độ
+    if sym == 4:
+        return row, n - col # Lật ngang
+    if sym == 5:
+        return col, row # Lật qua đường chéo chính
+    if sym == 6:
+        return n - row, col # Lật dọc
+    return n - col, n - row # Lật qua đường chéo phụ
+
+
+# INVERSE[s]: phép đối xứng đưa ảnh qua `s` về lại vị trí ban đầu (chỉ các phép quay 90/270 độ đổi chỗ nhau)
+INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)
+
+
+def symmetric_zobrist(size):
+    # keys[r * size + c][player] = tuple 8 khóa Zobrist của ô (r, c) qua từng phép đối xứng
+    keys = _symmetric_zobrist_cache.get(size)
+    if keys is None:
+        base = zobrist_keys(size)
+        keys = []
+        for row in range(size):
+            for col in range(size):
+                images = [transform(row, col, sym, size) for sym in range(SYMMETRIES)]
+                keys.append((None,) + tuple(tuple(base[r * size + c][player] for r, c in images)
+                                            for player in (1, 2)))
+        keys = _symmetric_zobrist_cache[size] = tuple(keys)
+    return keys
+
+
+def canonical(sym_hashes):
+    # (khóa chuẩn, phép đối xứng đưa thế cờ về hướng chuẩn)
+    best = 0
+    for sym in range(1, SYMMETRIES):
+        if sym_hashes[sym] < sym_hashes[best]:
+            best = sym
+    return sym_hashes[best], best
+
+
+def to_canonical(move, sym, size):
+    # Đổi nước đi từ hướng thật sang hướng chuẩn
+    if move is None or sym == 0:
+        return move
+    return transform(move[0], move[1], sym, size)
+
+
+def from_canonical(move, sym, size):
+    # Đổi nước đi lưu theo hướng chuẩn về hướng thật của bàn cờ
+    if move is None or sym == 0:
+        return move
+    return transform(move[0], move[1], INVERSE[sym], size)
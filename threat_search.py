@@ -0,0 +1,172 @@
+import time
+
+from pattern_eval import evaluator_for
+
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+class ThreatSearch:
+    # Tìm chuỗi thắng cưỡng bức (threat-space search) trước khi chạy tìm kiếm tổng quát.
+    # Bên tấn công chỉ đi các nước tạo "bốn" (còn 1 ô là thắng) hoặc "ba mở" (khi vct=True);
+    # bên phòng thủ chỉ xét các nước chặn bắt buộc (và các nước phản công tạo bốn khi bị đe dọa ba).
+    def __init__(self, max_depth=8, max_nodes=20000, max_time=0.25, vct=True):
+        self.max_depth = max_depth # Số nước tấn công tối đa trong chuỗi
+        self.max_nodes = max_nodes # Giới hạn số nút mỗi lần tìm
+        self.max_time = max_time # Giới hạn thời gian mỗi lần tìm (giây)
+        self.vct = vct # Cho phép nước tạo ba mở (victory by continuous threats), không chỉ bốn (VCF)
+        self.control = None
+        self.cache = {}
+        self.searches = 0
+        self.wins_found = 0
+        self.aborted = 0
+        self.total_nodes = 0
+        self.total_time = 0.0
+
+    def find_win(self, board, player, control=None):
+        # Trả về chuỗi nước đi thắng của `player` (nước đầu tiên đứng đầu) hoặc None.
+        # `control` (SearchControl của lượt suy nghĩ) cho phép hủy / giới hạn chung với tìm kiếm tổng quát
+        self.control = control
+        if board.evaluator is None:
+            board.evaluator = evaluator_for(board)
+        start = time.time()
+        self.deadline = start + self.max_time
+        self.nodes = 0
+        self.stopped = False
+        self.cache = {}
+        self.searches += 1
+        line = None
+        # Tìm sâu dần để trả về chuỗi thắng ngắn nhất
+        for depth in range(1, self.max_depth + 1):
+            line = self.attack(board, player, depth)
+            if line is not None or self.stopped:
+                break
+        if self.stopped:
+            self.aborted += 1
+        if line is not None:
+            self.wins_found += 1
+        self.total_nodes += self.nodes
+        self.total_time += time.time() - start
+        return line
+
+    def win_cells(self, board, player):
+        # Các ô mà `player` đánh vào sẽ thắng ngay
+        ev, k = board.evaluator, board.max_item_win
+        return [(r, c) for r, c in self.cells(board) if ev.completes(r, c, player, k - 1)]
+
+    def cells(self, board):
+        if board.candidates:
+            return board.candidates.sorted()
+        return board.get_empty_sqrs()
+
+    def threat_moves(self, board, player):
+        # Nước tạo bốn trước, sau đó nước tạo ba mở (chỉ với điều kiện thắng 5 quân)
+        ev, k = board.evaluator, board.max_item_win
+        fours, threes = [], []
+        for row, col in self.cells(board):
+            if ev.completes(row, col, player, k - 2):
+                fours.append((row, col))
+            elif self.vct and k == 5 and ev.completes(row, col, player, k - 3):
+                board.mark_sqr(row, col, player)
+                if open_three_at(board, row, col, player):
+                    threes.append((row, col))
+                board.unmake_sqr(row, col)
+        return fours, threes
+
+    def out_of_budget(self):
+        self.nodes += 1
+        if self.control is not None and self.control.tick():
+            self.stopped = True
+        elif self.nodes >= self.max_nodes or (self.nodes & 63 == 0 and time.time() > self.deadline):
+            self.stopped = True
+        return self.stopped
+
+    def attack(self, board, player, depth):
+        if self.out_of_budget():
+            return None
+        opponent = 3 - player
+        wins = self.win_cells(board, player)
+        if wins:
+            return [wins[0]]
+        if depth == 0:
+            return None
+        key = (board.hash, player, depth)
+        if key in self.cache:
+            return self.cache[key]
+
+        result = None
+        threats = self.win_cells(board, opponent)
+        if len(threats) < 2:
+            fours, threes = self.threat_moves(board, player)
+            if threats:
+                # Đối thủ đang có bốn: chỉ các nước vừa chặn vừa tạo đe dọa mới giữ được thế chủ động
+                fours = [m for m in fours if m in threats]
+                threes = [m for m in threes if m in threats]
+            for moves, is_four in ((fours, True), (threes, False)):
+                for row, col in moves:
+                    line = self.try_threat(board, player, row, col, depth, is_four)
+                    if line is not None:
+                        result = line
+                        break
+                    if self.stopped:
+                        break
+                if result is not None or self.stopped:
+                    break
+        if not self.stopped:
+            self.cache[key] = result
+        return result
+
+    def try_threat(self, board, player, row, col, depth, is_four):
+        opponent = 3 - player
+        board.mark_sqr(row, col, player)
+        if is_four:
+            replies = self.win_cells(board, player)
+            if len(replies) >= 2:
+                # Bốn mở / bốn kép: đối thủ không chặn được cả hai ô
+                board.unmake_sqr(row, col)
+                return [(row, col)]
+        else:
+            # Chặn ba mở: các ô phá cửa sổ có k - 2 quân của ta, hoặc phản công bằng nước tạo bốn
+            k = board.max_item_win
+            ev = board.evaluator
+            replies = [(r, c) for r, c in self.cells(board)
+                       if ev.completes(r, c, player, k - 2) or ev.completes(r, c, opponent, k - 2)]
+        line = None
+        for reply_row, reply_col in replies:
+            board.mark_sqr(reply_row, reply_col, opponent)
+            if board.final_state(reply_row, reply_col) == opponent:
+                sub = None # Đối thủ thắng trước
+            else:
+                sub = self.attack(board, player, depth - 1)
+            board.unmake_sqr(reply_row, reply_col)
+            if sub is None:
+                line = None
+                break
+            if line is None:
+                line = [(row, col), (reply_row, reply_col)] + sub
+        board.unmake_sqr(row, col)
+        return line if replies else None
+
+    def stats(self):
+        return {
+            "searches": self.searches,
+            "wins_found": self.wins_found,
+            "aborted": self.aborted,
+            "nodes": self.total_nodes,
+            "time": self.total_time,
+        }
+
+
+def open_three_at(board, row, col, player):
+    # Ô (row, col) của `player` có nằm trong một ba mở (liền hoặc cách một ô) có thể thành bốn mở không
+    patterns = ([0, player, player, player, 0, 0], [0, 0, player, player, player, 0],
+                [0, player, 0, player, player, 0], [0, player, player, 0, player, 0])
+    for dr, dc in DIRECTIONS:
+        line = []
+        for i in range(-5, 6):
+            r, c = row + i * dr, col + i * dc
+            line.append(board.squares[r][c] if 0 <= r < board.size and 0 <= c < board.size else -1)
+        for pattern in patterns:
+            for start in range(len(line) - len(pattern) + 1):
+                if line[start:start + len(pattern)] == pattern and start <= 5 < start + len(pattern):
+                    return True
+    return False
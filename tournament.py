@@ -0,0 +1,196 @@
+import argparse
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from caro_engine import Board, AI
+from game_record import GameWriter, new_game, add_move
+
+# Cho các cấu hình AI tự đấu với nhau (không cần giao diện) để biết một thay đổi có làm AI mạnh hơn
+# trong cùng thời gian suy nghĩ hay không. Mỗi cặp đấu đổi bên đi trước sau mỗi ván, khai cuộc ngẫu nhiên
+# lấy từ opening_book, và báo cáo thắng/hòa/thua kèm khoảng tin cậy, số nút/giây, độ sâu, thời gian mỗi nước.
+
+# Tên cấu hình -> tham số của AI, cùng các khóa riêng: "time_scale" (nhân giới hạn thời gian mỗi nước),
+# "max_nodes" (giới hạn số nút mỗi nước) và "threat_search" (False = tắt tìm chuỗi thắng cưỡng bức)
+CONFIGS = {
+    "pvs": {"search": "pvs"},
+    "minimax": {"search": "minimax"},
+    "scan": {"search": "pvs", "evaluator": "scan"},
+    "window": {"search": "pvs", "evaluator": "window"},
+    "loop-eval": {"search": "pvs", "evaluator": "window", "vectorized": False},
+    "no-threat": {"search": "pvs", "threat_search": False},
+    "pvs-2x": {"search": "pvs", "time_scale": 2.0},
+}
+
+Z_95 = 1.96
+
+
+def make_ai(player, config, max_time):
+    options = dict(config)
+    time_scale = options.pop("time_scale", 1.0)
+    threats = options.pop("threat_search", True)
+    max_nodes = options.pop("max_nodes", None)
+    ai = AI(player=player, **options)
+    ai.max_time = max_time * time_scale
+    ai.max_nodes = max_nodes
+    if not threats:
+        ai.threat_search.max_depth = 0
+    return ai
+
+
+def random_opening(size, plies, rng):
+    # Nước đầu lấy từ opening_book (hoặc quanh tâm nếu kích thước không có trong sách), các nước sau
+    # ngẫu nhiên trong vùng 3x3 quanh tâm để các ván không trùng nhau
+    book = AI().opening_book.get((size, size))
+    center = size // 2
+    near = [(r, c) for r in range(center - 1, center + 2) for c in range(center - 1, center + 2)]
+    moves = []
+    for ply in range(plies):
+        pool = book if ply == 0 and book else near
+        choices = [move for move in pool if move not in moves] or [move for move in near if move not in moves]
+        if not choices:
+            break
+        moves.append(rng.choice(choices))
+    return moves
+
+
+def play_game(size, first, second, opening, max_time):
+    # first / second: (tên, cấu hình); first cầm quân 1 (đi trước). Trả về người thắng (0 = hòa) và thống kê
+    board = Board(size)
+    record = new_game(size)
+    names = {1: first[0], 2: second[0]}
+    ais = {1: make_ai(1, first[1], max_time), 2: make_ai(2, second[1], max_time)}
+    stats = {player: {"moves": 0, "time": 0.0, "nodes": 0, "depth": 0, "searches": 0} for player in (1, 2)}
+    player, winner = 1, 0
+    for row, col in opening:
+        board.mark_sqr(row, col, player)
+        add_move(record, row, col, 0)
+        player = 3 - player
+    while not board.is_full():
+        ai, stat = ais[player], stats[player]
+        move, decision = ai.eval_with_stats(board)
+        stat["time"] += decision["time"]
+        stat["moves"] += 1
+        stat["nodes"] += decision["nodes"]
+        if decision["source"] == "search":
+            stat["depth"] += decision["depth"]
+            stat["searches"] += 1
+        if move is None or not board.empty_sqr(*move):
+            winner = 3 - player # Nước đi không hợp lệ bị xử thua
+            break
+        board.mark_sqr(move[0], move[1], player)
+        add_move(record, move[0], move[1], decision["time"] * 1000, decision)
+        if board.final_state(move[0], move[1]) != 0:
+            winner = player
+            break
+        player = 3 - player
+    for ai in ais.values():
+        ai.close()
+    record["result"] = int(winner)
+    return {"size": size, "names": names, "winner": winner, "stats": stats, "moves": board.marked_sqrs,
+            "record": record}
+
+
+def play_game_job(job):
+    return play_game(*job)
+
+
+def schedule(names, sizes, games, plies, max_time, seed):
+    # Mỗi cặp cấu hình chơi `games` ván trên mỗi kích thước, đổi bên đi trước với cùng khai cuộc
+    rng = random.Random(seed)
+    jobs = []
+    for size in sizes:
+        for i, a in enumerate(names):
+            for b in names[i + 1:]:
+                for game in range(games):
+                    if game % 2 == 0:
+                        opening = random_opening(size, plies, rng)
+                    first, second = (a, b) if game % 2 == 0 else (b, a)
+                    jobs.append((size, (first, CONFIGS[first]), (second, CONFIGS[second]), opening, max_time))
+    return jobs
+
+
+def score_interval(wins, draws, losses):
+    # Điểm trung bình (thắng = 1, hòa = 0.5) và khoảng tin cậy 95% theo xấp xỉ chuẩn
+    n = wins + draws + losses
+    if n == 0:
+        return 0.0, 0.0, 0.0
+    mean = (wins + 0.5 * draws) / n
+    variance = (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / n
+    margin = Z_95 * math.sqrt(variance / n)
+    return mean, max(0.0, mean - margin), min(1.0, mean + margin)
+
+
+def elo(score):
+    if score <= 0.0:
+        return -float('inf')
+    if score >= 1.0:
+        return float('inf')
+    return -400 * math.log10(1 / score - 1) + 0.0 # + 0.0 để không in ra -0
+
+
+def summarize(results):
+    # Gom kết quả theo (kích thước, A, B) với A/B theo thứ tự cố định, và thống kê tìm kiếm theo cấu hình
+    pairs, engines = {}, {}
+    for result in results:
+        names, winner = result["names"], result["winner"]
+        a, b = sorted(names.values())
+        record = pairs.setdefault((result["size"], a, b), {"W": 0, "D": 0, "L": 0})
+        if winner == 0:
+            record["D"] += 1
+        elif names[winner] == a:
+            record["W"] += 1
+        else:
+            record["L"] += 1
+        for player, stat in result["stats"].items():
+            total = engines.setdefault((result["size"], names[player]),
+                                       {"moves": 0, "time": 0.0, "nodes": 0, "depth": 0, "searches": 0})
+            for key, value in stat.items():
+                total[key] += value
+    return pairs, engines
+
+
+def report(pairs, engines):
+    for (size, a, b), record in sorted(pairs.items()):
+        mean, low, high = score_interval(record["W"], record["D"], record["L"])
+        print(f"{size}x{size} {a} vs {b}: +{record['W']} ={record['D']} -{record['L']}"
+              f"  điểm {mean:.3f} [{low:.3f}, {high:.3f}]  Elo {elo(mean):+.0f}")
+    for (size, name), total in sorted(engines.items()):
+        moves = total["moves"] or 1
+        nps = total["nodes"] / total["time"] if total["time"] else 0.0
+        depth = total["depth"] / total["searches"] if total["searches"] else 0.0
+        print(f"{size}x{size} {name:>10}: {nps:8.0f} nút/s  độ sâu TB {depth:4.1f}"
+              f"  {total['time'] / moves:6.3f}s/nước  ({total['moves']} nước)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cho các cấu hình AI tự đấu với nhau")
+    parser.add_argument("--configs", nargs="+", default=["pvs", "minimax"], choices=sorted(CONFIGS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[5, 7, 11])
+    parser.add_argument("--games", type=int, default=10, help="số ván mỗi cặp cấu hình trên mỗi kích thước")
+    parser.add_argument("--time", type=float, default=0.2, help="giới hạn thời gian mỗi nước đi (giây)")
+    parser.add_argument("--opening-plies", type=int, default=2, help="số nước khai cuộc ngẫu nhiên")
+    parser.add_argument("--workers", type=int, default=1, help="số tiến trình chơi song song")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--record", metavar="ARCHIVE", help="Ghi nối tiếp biên bản các ván vào tệp (game_record)")
+    args = parser.parse_args()
+
+    jobs = schedule(args.configs, args.sizes, args.games, args.opening_plies, args.time, args.seed)
+    start = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(play_game_job, jobs))
+    else:
+        results = [play_game_job(job) for job in jobs]
+    print(f"{len(results)} ván trong {time.perf_counter() - start:.1f}s")
+    if args.record:
+        writer = GameWriter(args.record)
+        for result in results:
+            writer.write(result["record"])
+        writer.close()
+    report(*summarize(results))
+
+
+if __name__ == '__main__':
+    main()
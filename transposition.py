@@ -0,0 +1,115 @@
+import random
+import sys
+
+EXACT, LOWER, UPPER = 0, 1, 2 # Loại giá trị lưu trong bảng: chính xác, cận dưới, cận trên
+
+
+def flip_bound(flag):
+    # Đổi loại giá trị khi đổi dấu điểm (góc nhìn của bên kia): cận dưới <-> cận trên
+    if flag == LOWER:
+        return UPPER
+    if flag == UPPER:
+        return LOWER
+    return flag
+
+
+ZOBRIST_SEED = 20240501 # Hạt giống cố định để khóa Zobrist giống nhau giữa các ván và các tiến trình
+SIDE_KEY = random.Random(ZOBRIST_SEED - 1).getrandbits(64) # Khóa XOR thêm khi tới lượt bên cực đại
+
+_zobrist_cache = {}
+
+
+def zobrist_keys(size):
+    # Trả về bảng khóa Zobrist cho bàn cờ size x size: keys[r * size + c][player] (player = 1, 2)
+    keys = _zobrist_cache.get(size)
+    if keys is None:
+        rng = random.Random(ZOBRIST_SEED + size)
+        keys = tuple((0, rng.getrandbits(64), rng.getrandbits(64)) for _ in range(size * size))
+        _zobrist_cache[size] = keys
+    return keys
+
+
+class TTEntry:
+    __slots__ = ("key", "depth", "flag", "score", "move", "age")
+
+    def __init__(self, key, depth, flag, score, move, age):
+        self.key = key
+        self.depth = depth
+        self.flag = flag
+        self.score = score
+        self.move = move
+        self.age = age
+
+
+# Ước lượng bộ nhớ cho mỗi ô: đối tượng TTEntry, khóa 64 bit, tuple nước đi và con trỏ trong danh sách
+ENTRY_BYTES = sys.getsizeof(TTEntry(0, 0, 0, 0, None, 0)) + sys.getsizeof(2 ** 63) + sys.getsizeof((0, 0)) + 8
+
+
+class TranspositionTable:
+    # Bảng chuyển vị có kích thước cố định: mỗi khóa Zobrist ánh xạ vào một ô (key % số ô).
+    # Khi trùng ô, mục cũ từ lượt tìm kiếm trước (tuổi khác) hoặc nông hơn sẽ bị thay thế.
+    def __init__(self, max_mb=16):
+        self.max_mb = max_mb
+        self.capacity = max(1, int(max_mb * 1024 * 1024) // ENTRY_BYTES) # Số ô tối đa theo giới hạn bộ nhớ
+        self.slots = [None] * self.capacity
+        self.age = 0 # Tăng mỗi khi AI bắt đầu tìm nước đi mới
+        self.used = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_search(self):
+        # Gọi trước mỗi nước đi: các mục cũ vẫn dùng được nhưng được ưu tiên thay thế
+        self.age += 1
+
+    def probe(self, key):
+        self.probes += 1
+        entry = self.slots[key % self.capacity]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        index = key % self.capacity
+        entry = self.slots[index]
+        if entry is None:
+            self.used += 1
+        elif entry.key == key:
+            # Giữ kết quả sâu hơn của cùng thế cờ trong cùng lượt tìm kiếm
+            if depth < entry.depth and entry.age == self.age:
+                return
+            if move is None:
+                move = entry.move
+        elif entry.age == self.age and depth < entry.depth:
+            return
+        else:
+            self.replacements += 1
+        self.stores += 1
+        self.slots[index] = TTEntry(key, depth, flag, score, move, self.age)
+
+    def best_move(self, key):
+        entry = self.slots[key % self.capacity]
+        if entry is not None and entry.key == key:
+            return entry.move
+        return None
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def clear(self):
+        self.slots = [None] * self.capacity
+        self.used = 0
+
+    def stats(self):
+        return {
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate(),
+            "stores": self.stores,
+            "replacements": self.replacements,
+            "used": self.used,
+            "capacity": self.capacity,
+            "age": self.age,
+        }
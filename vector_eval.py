@@ -0,0 +1,95 @@
+import numpy as np
+
+from pattern_eval import window_score
+
+_tables = {}
+
+
+def _window_table(k, player):
+    # Bảng điểm theo mã cửa sổ (số quân người 1) * (k + 1) + (số quân người 2), theo góc nhìn `player`
+    table = _tables.get((k, player))
+    if table is None:
+        table = np.zeros((k + 1) * (k + 1), dtype=np.int64)
+        for c1 in range(k + 1):
+            for c2 in range(k + 1 - c1):
+                mine, theirs = (c1, c2) if player == 1 else (c2, c1)
+                table[c1 * (k + 1) + c2] = window_score(mine, theirs, k)
+        _tables[(k, player)] = table
+    return table
+
+
+def _window_sums(mask, k):
+    # Tổng của `mask` trên mọi cửa sổ k ô nằm trọn trong bàn cờ, theo 4 hướng của AI.evaluate_sequences.
+    # Chỉ lặp k lần trên các lát cắt, không lặp theo từng ô.
+    n = mask.shape[0]
+    m = n - k + 1
+    if m <= 0:
+        return []
+    rows = sum(mask[:, i:i + m] for i in range(k))                     # (0, 1): ô (r, c + i)
+    cols = sum(mask[i:i + m, :] for i in range(k))                     # (1, 0): ô (r + i, c)
+    diag = sum(mask[i:i + m, i:i + m] for i in range(k))               # (1, 1): ô (r + i, c + i)
+    anti = sum(mask[i:i + m, k - 1 - i:k - 1 - i + m] for i in range(k)) # (1, -1): ô (r + i, c - i)
+    return [rows, cols, diag, anti]
+
+
+def sequences_score(squares, player, k):
+    # Tương đương AI.evaluate_sequences: cộng window_score của mọi cửa sổ k ô.
+    # Mã hóa ô người 1 = k + 1, người 2 = 1 nên tổng trên cửa sổ chính là mã tra bảng.
+    squares = np.asarray(squares)
+    encoded = np.where(squares == 1, k + 1, (squares == 2).astype(np.int64))
+    table = _window_table(k, player)
+    return sum(int(table[codes].sum()) for codes in _window_sums(encoded, k))
+
+
+def _line_sums(padded, n, k, dr, dc):
+    # Với mỗi ô (r, c): tổng của `padded` trên đoạn i = -k + 1 .. k - 1 theo hướng (dr, dc)
+    pad = k - 1
+    total = 0
+    for i in range(-pad, pad + 1):
+        r0, c0 = pad + i * dr, pad + i * dc
+        total = total + padded[r0:r0 + n, c0:c0 + n]
+    return total
+
+
+_potential = {}
+
+
+def _potential_tables(n, k):
+    # Mã hóa ô: quân mình = 1, quân đối thủ = B, ô trống = B * B (B = 2k lớn hơn độ dài đoạn),
+    # nên tổng trên một đoạn cho ra đồng thời ba số đếm. `points[tổng]` là điểm của mình trừ điểm đối thủ
+    # theo các mức của pattern_tables.potential_points. `valid[d]` đánh dấu các ô có đoạn line_code không rỗng.
+    cached = _potential.get((n, k))
+    if cached is None:
+        base = 2 * k
+        points = np.zeros((2 * k - 1) * base * base + 1, dtype=np.int64)
+        for code in range(points.size):
+            mine, theirs, empties = code % base, code // base % base, code // (base * base)
+            for count, sign in ((mine, 1), (theirs, -1)):
+                if count == k - 2 and empties == 2:
+                    points[code] += sign * 50
+                elif count == k - 3 and empties == 3:
+                    points[code] += sign * 10
+        rows, cols = np.indices((n, n))
+        valid = []
+        for dr, dc in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+            # line_code dừng ngay nếu ô đầu tiên (i = -k + 1) nằm ngoài bàn cờ, khi đó đoạn thẳng rỗng
+            start_r, start_c = rows - (k - 1) * dr, cols - (k - 1) * dc
+            valid.append((start_r >= 0) & (start_r < n) & (start_c >= 0) & (start_c < n))
+        cached = _potential[(n, k)] = (base, points, valid)
+    return cached
+
+
+def potential_score(squares, player, k):
+    # Tương đương AI.evaluate_potential_advantages: với mỗi ô trống, cộng điểm tiềm năng của `player`
+    # và trừ điểm của đối thủ trên đoạn line_code theo 4 hướng
+    squares = np.asarray(squares)
+    n = squares.shape[0]
+    base, points, valid = _potential_tables(n, k)
+    empty = squares == 0
+    encoded = np.where(empty, base * base, np.where(squares == player, 1, base))
+    padded = np.pad(encoded, k - 1)
+    score = 0
+    for d, (dr, dc) in enumerate([(0, 1), (1, 0), (1, 1), (1, -1)]):
+        codes = _line_sums(padded, n, k, dr, dc)
+        score += int(points[codes[empty & valid[d]]].sum())
+    return score